@@ -1,11 +1,18 @@
-from typing import Final
+from typing import TYPE_CHECKING, Any, Final
 
-import atrclient.client
+if TYPE_CHECKING:
+    import atrclient.client
 
-VERSION = atrclient.client.VERSION
-main = atrclient.client.main
+    VERSION = atrclient.client.VERSION
+    main = atrclient.client.main
 
 __all__: Final[list[str]] = ["VERSION", "main"]
 
-del Final
-del atrclient
+
+def __getattr__(name: str) -> Any:
+    # The client is only imported when needed, so worker processes can import submodules cheaply
+    if name in __all__:
+        import atrclient.client
+
+        return getattr(atrclient.client, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
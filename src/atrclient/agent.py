@@ -0,0 +1,145 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import json
+import os
+import pathlib
+import socket
+from typing import TYPE_CHECKING, Any, Final
+
+import platformdirs
+
+import atrclient.sign as sign
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+    import openpgp
+
+CONNECT_TIMEOUT: Final[float] = 1.0
+SOCKET_ENV: Final[str] = "ATR_SIGN_AGENT_SOCKET"
+
+
+class Agent:
+    def __init__(
+        self,
+        fingerprint: str,
+        component: openpgp.SecretKey | openpgp.SecretSubkey,
+        password: str | None,
+    ) -> None:
+        self.fingerprint = fingerprint
+        self.component = component
+        self.password = password
+        self.stopped = asyncio.Event()
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            response = await self.respond(json.loads(await reader.readline()))
+        except (json.JSONDecodeError, AttributeError, TypeError) as e:
+            response = {"error": f"Invalid request: {e}"}
+        writer.write(json.dumps(response).encode("utf-8") + b"\n")
+        with contextlib.suppress(ConnectionError):
+            await writer.drain()
+        writer.close()
+
+    async def respond(self, message: dict[str, Any]) -> dict[str, Any]:
+        match message.get("op"):
+            case "ping":
+                return {"fingerprint": self.fingerprint}
+            case "sign":
+                path = message.get("path")
+                algorithms = message.get("digests", [])
+                if (not isinstance(path, str)) or (not isinstance(algorithms, list)):
+                    return {"error": "Invalid request: sign requires a path and a list of digests"}
+                try:
+                    armored, digests = await asyncio.to_thread(
+                        sign.sign_detached_digests, pathlib.Path(path), self.component, self.password, algorithms
+                    )
+                except (OSError, ValueError) as e:
+                    return {"error": str(e)}
+                return {"signature": armored, "digests": digests}
+            case "stop":
+                self.stopped.set()
+                return {"stopped": True}
+            case op:
+                return {"error": f"Unknown operation: {op}"}
+
+    async def serve(self, path: pathlib.Path, ttl: float) -> None:
+        # The socket is private to the user, who can already read the key file and the artifacts
+        path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+        path.unlink(missing_ok=True)
+        server = await asyncio.start_unix_server(self.handle, path)
+        path.chmod(0o600)
+        try:
+            async with server:
+                with contextlib.suppress(TimeoutError):
+                    await asyncio.wait_for(self.stopped.wait(), ttl)
+        finally:
+            path.unlink(missing_ok=True)
+
+
+def holds(fingerprint: str) -> bool:
+    response = request({"op": "ping"})
+    return (response is not None) and (response.get("fingerprint", "").lower() == fingerprint.lower())
+
+
+def request(message: dict[str, Any]) -> dict[str, Any] | None:
+    if not hasattr(socket, "AF_UNIX"):
+        return None
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(CONNECT_TIMEOUT)
+            sock.connect(str(socket_path()))
+            # Signing a large artifact can take much longer than connecting
+            sock.settimeout(None)
+            sock.sendall(json.dumps(message).encode("utf-8") + b"\n")
+            with sock.makefile("rb") as fh:
+                line = fh.readline()
+    except (ConnectionRefusedError, FileNotFoundError, TimeoutError):
+        return None
+    if not line:
+        return None
+    try:
+        response = json.loads(line)
+    except ValueError:
+        response = None
+    if not isinstance(response, dict):
+        return {"error": "Invalid response from the signing agent"}
+    return response
+
+
+def sign_file(path: pathlib.Path, digests: Sequence[str] = ()) -> tuple[str, dict[str, str]]:
+    response = request({"op": "sign", "path": str(path.resolve()), "digests": list(digests)})
+    if response is None:
+        raise ValueError("The signing agent is not running")
+    if "error" in response:
+        raise ValueError(response["error"])
+    return response["signature"], response["digests"]
+
+
+def socket_path() -> pathlib.Path:
+    if env := os.getenv(SOCKET_ENV):
+        return pathlib.Path(env).expanduser()
+    return platformdirs.user_runtime_path("atr", appauthor="ASF") / "sign-agent.sock"
+
+
+def stop() -> bool:
+    return request({"op": "stop"}) is not None
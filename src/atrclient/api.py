@@ -15,295 +15,329 @@
 # specific language governing permissions and limitations
 # under the License.
 
-# TODO: Allow upload and download by calling rsync
-# Or potentially native for downloads, which should be trivial
-# There is also https://github.com/synodriver/pyrsync
-
 from __future__ import annotations
 
-import asyncio
 import functools
-from typing import TYPE_CHECKING, TypeVar
-
-if TYPE_CHECKING:
-    from collections.abc import Callable
-
-import aiohttp
-import pydantic
+from typing import TYPE_CHECKING, Any, Concatenate, Self
 
 import atrclient.basic as basic
 import atrclient.config as config
+import atrclient.lazy as lazy
 import atrclient.models as models
 import atrclient.show as show
 import atrclient.web as web
 
+if TYPE_CHECKING:
+    import pathlib
+    from collections.abc import AsyncIterator, Callable, Coroutine
+    from types import TracebackType
 
-class ApiCore:
-    def __init__(self, path: str):
-        host, verify_ssl = config.host_get()
-        self.url = f"https://{host}/api{path}"
-        self.verify_ssl = verify_ssl
-
-
-class ApiGet(ApiCore):
-    def __init__(self, path: str, bearer: bool = False):
-        super().__init__(path)
-        self.bearer = bearer
-
-    def get(self, *args: str, **kwargs: str | None) -> basic.JSON:
-        url = self.url + "/" + "/".join(args)
-        for value in kwargs.values():
-            if value is not None:
-                url += f"/{value}"
-        jwt_value = config.jwt_usable() if self.bearer else None
-        return asyncio.run(web.get(url, jwt_value, self.verify_ssl))
-
-
-class ApiPost(ApiCore):
-    def post(self, args: models.schema.Strict) -> basic.JSON:
-        jwt_value = config.jwt_usable()
-        return asyncio.run(web.post(self.url, args, jwt_value, self.verify_ssl))
-
-
-A = TypeVar("A", bound=models.schema.Strict)
-R = TypeVar("R", bound=models.api.Results)
-
-
-def get(path: str, bearer: bool = False) -> Callable[[Callable[..., R]], Callable[..., R]]:
-    def decorator(func: Callable[..., R]) -> Callable[..., R]:
-        @functools.wraps(func)
-        def wrapper(*args: str, **kwargs: str | None) -> R:
-            api_instance = ApiGet(path, bearer)
-            try:
-                response = func(api_instance, *args, **kwargs)
-            except pydantic.ValidationError as e:
-                error_summary = "\n".join([f"  - {err['loc'][1]}: {err['msg']}" for err in e.errors()])
-                show.error_and_exit(f"API response failed validation:\n{error_summary}")
-            except (aiohttp.ClientError, models.api.ResultsTypeError) as e:
-                show.error_and_exit(f"Unexpected API GET response: {e}")
-            else:
-                return response
-
-        return wrapper
-
-    return decorator
-
-
-def post(path: str) -> Callable[[Callable[[ApiPost, A], R]], Callable[[A], R]]:
-    def decorator(func: Callable[[ApiPost, A], R]) -> Callable[[A], R]:
-        def wrapper(args: A) -> R:
-            api_instance = ApiPost(path)
-            try:
-                response = func(api_instance, args)
-            except (pydantic.ValidationError, models.api.ResultsTypeError) as e:
-                show.error_and_exit(f"Unexpected API POST response: {e}")
-            return response
-
-        return wrapper
-
-    return decorator
-
-
-@get("/checks/list")
-def checks_list(api: ApiGet, project: str, version: str, revision: str | None = None) -> models.api.ChecksListResults:
-    response = api.get(project, version, revision=revision)
-    return models.api.validate_checks_list(response)
-
-
-@get("/checks/ongoing")
-def checks_ongoing(
-    api: ApiGet, project: str, version: str, revision: str | None = None
-) -> models.api.ChecksOngoingResults:
-    response = api.get(project, version, revision=revision)
-    return models.api.validate_checks_ongoing(response)
-
-
-@get("/committee/keys")
-def committee_keys(api: ApiGet, name: str) -> models.api.CommitteeKeysResults:
-    response = api.get(name)
-    return models.api.validate_committee_keys(response)
-
-
-@get("/distribution/list")
-def distribution_list(api: ApiGet, project: str, version: str) -> models.api.DistributionListResults:
-    response = api.get(project, version)
-    return models.api.validate_distribution_list(response)
-
-
-@post("/distribution/record")
-def distribution_record(api: ApiPost, args: models.api.DistributionRecordArgs) -> models.api.DistributionRecordResults:
-    response = api.post(args)
-    return models.api.validate_distribution_record(response)
-
-
-@post("/ignore/add")
-def ignore_add(api: ApiPost, args: models.api.IgnoreAddArgs) -> models.api.IgnoreAddResults:
-    response = api.post(args)
-    return models.api.validate_ignore_add(response)
-
-
-@post("/ignore/delete")
-def ignore_delete(api: ApiPost, args: models.api.IgnoreDeleteArgs) -> models.api.IgnoreDeleteResults:
-    response = api.post(args)
-    return models.api.validate_ignore_delete(response)
-
-
-@get("/ignore/list")
-def ignore_list(api: ApiGet, committee: str) -> models.api.IgnoreListResults:
-    response = api.get(committee)
-    return models.api.validate_ignore_list(response)
-
-
-@post("/key/add")
-def key_add(api: ApiPost, args: models.api.KeyAddArgs) -> models.api.KeyAddResults:
-    response = api.post(args)
-    return models.api.validate_key_add(response)
-
-
-@post("/key/delete")
-def key_delete(api: ApiPost, args: models.api.KeyDeleteArgs) -> models.api.KeyDeleteResults:
-    response = api.post(args)
-    return models.api.validate_key_delete(response)
-
-
-@get("/key/get")
-def key_get(api: ApiGet, fingerprint: str) -> models.api.KeyGetResults:
-    response = api.get(fingerprint)
-    return models.api.validate_key_get(response)
-
-
-@post("/keys/upload")
-def keys_upload(api: ApiPost, args: models.api.KeysUploadArgs) -> models.api.KeysUploadResults:
-    response = api.post(args)
-    return models.api.validate_keys_upload(response)
-
-
-@get("/keys/user")
-def keys_user(api: ApiGet, asf_uid: str) -> models.api.KeysUserResults:
-    response = api.get(asf_uid)
-    return models.api.validate_keys_user(response)
-
-
-@get("/project/get")
-def project_get(api: ApiGet, project: str) -> models.api.ProjectGetResults:
-    response = api.get(project)
-    return models.api.validate_project_get(response)
-
-
-@get("/project/releases")
-def project_releases(api: ApiGet, project: str) -> models.api.ProjectReleasesResults:
-    response = api.get(project)
-    return models.api.validate_project_releases(response)
-
-
-@post("/release/announce")
-def release_announce(api: ApiPost, args: models.api.ReleaseAnnounceArgs) -> models.api.ReleaseAnnounceResults:
-    response = api.post(args)
-    return models.api.validate_release_announce(response)
-
-
-@post("/release/create")
-def release_create(api: ApiPost, args: models.api.ReleaseCreateArgs) -> models.api.ReleaseCreateResults:
-    response = api.post(args)
-    return models.api.validate_release_create(response)
-
-
-@post("/release/delete")
-def release_delete(api: ApiPost, args: models.api.ReleaseDeleteArgs) -> models.api.ReleaseDeleteResults:
-    response = api.post(args)
-    return models.api.validate_release_delete(response)
-
-
-@post("/release/draft/delete")
-def release_draft_delete(api: ApiPost, args: models.api.ReleaseDraftDeleteArgs) -> models.api.ReleaseDraftDeleteResults:
-    response = api.post(args)
-    return models.api.validate_release_draft_delete(response)
-
-
-@get("/release/paths")
-def release_paths(
-    api: ApiGet, project: str, version: str, revision: str | None = None
-) -> models.api.ReleasePathsResults:
-    response = api.get(project, version, revision=revision)
-    return models.api.validate_release_paths(response)
-
-
-@get("/release/get")
-def release_get(api: ApiGet, project: str, version: str) -> models.api.ReleaseGetResults:
-    response = api.get(project, version)
-    return models.api.validate_release_get(response)
-
-
-@get("/release/revisions")
-def release_revisions(api: ApiGet, project: str, version: str) -> models.api.ReleaseRevisionsResults:
-    response = api.get(project, version)
-    return models.api.validate_release_revisions(response)
+    import pydantic
+else:
+    pydantic = lazy.module("pydantic")
 
 
-def release_upload(args: models.api.ReleaseUploadArgs) -> models.api.ReleaseUploadResults | None:
-    # Not decorated with @post because a quarantined upload gives a 202 response
-    # Since the 202 has no corresponding Results model, the return here is None
-    api_instance = ApiPost("/release/upload")
+class AsyncClient:
+    def __init__(self) -> None:
+        host, verify_ssl = config.host_get()
+        self.url = f"https://{host}/api"
+        self.verify_ssl = verify_ssl
+        self.entered = False
+
+    async def __aenter__(self) -> Self:
+        web.POOL.acquire()
+        self.entered = True
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        await self.close()
+
+    async def checks_list(
+        self, project: str, version: str, revision: str | None = None
+    ) -> models.api.ChecksListResults:
+        response = await self.get("/checks/list", project, version, revision)
+        return validate(models.api.validate_checks_list, response)
+
+    async def checks_ongoing(
+        self, project: str, version: str, revision: str | None = None
+    ) -> models.api.ChecksOngoingResults:
+        response = await self.get("/checks/ongoing", project, version, revision)
+        return validate(models.api.validate_checks_ongoing, response)
+
+    async def checks_ongoing_events(
+        self, project: str, version: str, revision: str | None = None
+    ) -> AsyncIterator[models.api.ChecksOngoingResults]:
+        url = self.path_url("/checks/ongoing/events", project, version, revision)
+        async for data in web.events(url, None, self.verify_ssl):
+            yield validate(models.api.validate_checks_ongoing, data)
+
+    async def close(self) -> None:
+        # The sessions are shared by every client in the loop, so they are only closed when the last client exits
+        if self.entered:
+            self.entered = False
+            await web.POOL.release()
+
+    async def committee_keys(self, name: str) -> models.api.CommitteeKeysResults:
+        response = await self.get("/committee/keys", name)
+        return validate(models.api.validate_committee_keys, response)
+
+    async def distribution_list(self, project: str, version: str) -> models.api.DistributionListResults:
+        response = await self.get("/distribution/list", project, version)
+        return validate(models.api.validate_distribution_list, response)
+
+    async def distribution_record(
+        self, args: models.api.DistributionRecordArgs
+    ) -> models.api.DistributionRecordResults:
+        response = await self.post("/distribution/record", args)
+        return validate(models.api.validate_distribution_record, response)
+
+    async def get(self, path: str, *args: str | None, bearer: bool = False, optional: bool = False) -> bytes:
+        jwt_value = (await config.jwt_usable_async()) if bearer else None
+        return await web.get(self.path_url(path, *args), jwt_value, self.verify_ssl, optional)
+
+    async def ignore_add(self, args: models.api.IgnoreAddArgs) -> models.api.IgnoreAddResults:
+        response = await self.post("/ignore/add", args)
+        return validate(models.api.validate_ignore_add, response)
+
+    async def ignore_delete(self, args: models.api.IgnoreDeleteArgs) -> models.api.IgnoreDeleteResults:
+        response = await self.post("/ignore/delete", args)
+        return validate(models.api.validate_ignore_delete, response)
+
+    async def ignore_list(self, committee: str) -> models.api.IgnoreListResults:
+        response = await self.get("/ignore/list", committee)
+        return validate(models.api.validate_ignore_list, response)
+
+    async def key_add(self, args: models.api.KeyAddArgs) -> models.api.KeyAddResults:
+        response = await self.post("/key/add", args)
+        return validate(models.api.validate_key_add, response)
+
+    async def key_delete(self, args: models.api.KeyDeleteArgs) -> models.api.KeyDeleteResults:
+        response = await self.post("/key/delete", args)
+        return validate(models.api.validate_key_delete, response)
+
+    async def key_get(self, fingerprint: str) -> models.api.KeyGetResults:
+        response = await self.get("/key/get", fingerprint)
+        return validate(models.api.validate_key_get, response)
+
+    async def keys_upload(self, args: models.api.KeysUploadArgs) -> models.api.KeysUploadResults:
+        response = await self.post("/keys/upload", args)
+        return validate(models.api.validate_keys_upload, response)
+
+    async def keys_user(self, asf_uid: str) -> models.api.KeysUserResults:
+        response = await self.get("/keys/user", asf_uid)
+        return validate(models.api.validate_keys_user, response)
+
+    def path_url(self, path: str, *args: str | None) -> str:
+        url = self.url + path
+        for arg in args:
+            if arg is not None:
+                url += f"/{arg}"
+        return url
+
+    async def post(self, path: str, args: models.schema.Strict, optional: bool = False) -> bytes:
+        jwt_value = await config.jwt_usable_async()
+        return await web.post(self.url + path, args, jwt_value, self.verify_ssl, optional)
+
+    async def project_get(self, project: str) -> models.api.ProjectGetResults:
+        response = await self.get("/project/get", project)
+        return validate(models.api.validate_project_get, response)
+
+    async def project_releases(self, project: str) -> models.api.ProjectReleasesResults:
+        response = await self.get("/project/releases", project)
+        return validate(models.api.validate_project_releases, response)
+
+    async def quarantine_get(self, project: str, version: str, token: str) -> models.api.QuarantineGetResults:
+        response = await self.get("/quarantine/get", project, version, token, bearer=True, optional=True)
+        return validate(models.api.validate_quarantine_get, response)
+
+    async def release_announce(self, args: models.api.ReleaseAnnounceArgs) -> models.api.ReleaseAnnounceResults:
+        response = await self.post("/release/announce", args)
+        return validate(models.api.validate_release_announce, response)
+
+    async def release_attestable(
+        self, project: str, version: str, revision: str | None = None
+    ) -> models.api.ReleaseAttestableResults:
+        response = await self.get("/release/attestable", project, version, revision, optional=True)
+        return validate(models.api.validate_release_attestable, response)
+
+    async def release_create(self, args: models.api.ReleaseCreateArgs) -> models.api.ReleaseCreateResults:
+        response = await self.post("/release/create", args)
+        return validate(models.api.validate_release_create, response)
+
+    async def release_delete(self, args: models.api.ReleaseDeleteArgs) -> models.api.ReleaseDeleteResults:
+        response = await self.post("/release/delete", args)
+        return validate(models.api.validate_release_delete, response)
+
+    async def release_draft_delete(
+        self, args: models.api.ReleaseDraftDeleteArgs
+    ) -> models.api.ReleaseDraftDeleteResults:
+        response = await self.post("/release/draft/delete", args)
+        return validate(models.api.validate_release_draft_delete, response)
+
+    async def release_get(self, project: str, version: str) -> models.api.ReleaseGetResults:
+        response = await self.get("/release/get", project, version)
+        return validate(models.api.validate_release_get, response)
+
+    async def release_patch(
+        self, args: models.api.ReleasePatchArgs, chunks: AsyncIterator[bytes]
+    ) -> models.api.ReleasePatchResults | models.api.ReleaseUploadQuarantined:
+        jwt_value = await config.jwt_usable_async()
+        url = self.url + "/release/patch"
+        response = web.json_parse(await web.post_form(url, args, chunks, "delta", jwt_value, self.verify_ssl))
+        if (held := quarantined(response)) is not None:
+            return held
+        return validate(models.api.validate_release_patch, response)
+
+    async def release_paths(
+        self, project: str, version: str, revision: str | None = None
+    ) -> models.api.ReleasePathsResults:
+        response = await self.get("/release/paths", project, version, revision)
+        return validate(models.api.validate_release_paths, response)
+
+    async def release_revision(self, project: str, version: str, revision: str) -> models.api.ReleaseRevisionResults:
+        response = await self.get("/release/revision", project, version, revision, optional=True)
+        return validate(models.api.validate_release_revision, response)
+
+    async def release_revisions(self, project: str, version: str) -> models.api.ReleaseRevisionsResults:
+        response = await self.get("/release/revisions", project, version)
+        return validate(models.api.validate_release_revisions, response)
+
+    async def release_signatures(self, project: str, version: str) -> models.api.ReleaseSignaturesResults:
+        response = await self.get("/release/signatures", project, version)
+        return validate(models.api.validate_release_signatures, response)
+
+    async def release_upload(
+        self, args: models.api.ReleaseUploadArgs
+    ) -> models.api.ReleaseUploadResults | models.api.ReleaseUploadQuarantined:
+        response = web.json_parse(await self.post("/release/upload", args))
+        if (held := quarantined(response)) is not None:
+            return held
+        return validate(models.api.validate_release_upload, response)
+
+    async def release_upload_batch(
+        self, args: models.api.ReleaseUploadBatchArgs
+    ) -> models.api.ReleaseUploadBatchResults | models.api.ReleaseUploadQuarantined:
+        response = web.json_parse(await self.post("/release/upload/batch", args, optional=True))
+        if (held := quarantined(response)) is not None:
+            return held
+        return validate(models.api.validate_release_upload_batch, response)
+
+    async def release_upload_stream(
+        self, args: models.api.ReleaseUploadStreamArgs, path: pathlib.Path
+    ) -> models.api.ReleaseUploadResults | models.api.ReleaseUploadQuarantined:
+        jwt_value = await config.jwt_usable_async()
+        url = self.url + "/release/upload/stream"
+        response = web.json_parse(await web.post_file(url, args, path, jwt_value, self.verify_ssl, optional=True))
+        if (held := quarantined(response)) is not None:
+            return held
+        return validate(models.api.validate_release_upload, response)
+
+    async def sbom_generate(self, args: models.api.SbomGenerateArgs) -> models.api.SbomGenerateResults:
+        response = await self.post("/sbom/generate", args)
+        return validate(models.api.validate_sbom_generate, response)
+
+    async def signature_provenance(
+        self, args: models.api.SignatureProvenanceArgs
+    ) -> models.api.SignatureProvenanceResults:
+        response = await self.post("/signature/provenance", args)
+        return validate(models.api.validate_signature_provenance, response)
+
+    async def ssh_key_add(self, args: models.api.SshKeyAddArgs) -> models.api.SshKeyAddResults:
+        response = await self.post("/ssh-key/add", args)
+        return validate(models.api.validate_ssh_key_add, response)
+
+    async def ssh_key_delete(self, args: models.api.SshKeyDeleteArgs) -> models.api.SshKeyDeleteResults:
+        response = await self.post("/ssh-key/delete", args)
+        return validate(models.api.validate_ssh_key_delete, response)
+
+    async def ssh_keys_list(self, asf_uid: str) -> models.api.SshKeysListResults:
+        response = await self.get("/ssh-keys/list", asf_uid)
+        return validate(models.api.validate_ssh_keys_list, response)
+
+    async def task_get(self, task_id: str) -> models.api.TaskGetResults:
+        response = await self.get("/task/get", task_id, bearer=True)
+        return validate(models.api.validate_task_get, response)
+
+    async def vote_resolve(self, args: models.api.VoteResolveArgs) -> models.api.VoteResolveResults:
+        response = await self.post("/vote/resolve", args)
+        return validate(models.api.validate_vote_resolve, response)
+
+    async def vote_start(self, args: models.api.VoteStartArgs) -> models.api.VoteStartResults:
+        response = await self.post("/vote/start", args)
+        return validate(models.api.validate_vote_start, response)
+
+    async def vote_tabulate(self, args: models.api.VoteTabulateArgs) -> models.api.VoteTabulateResults:
+        response = await self.post("/vote/tabulate", args)
+        return validate(models.api.validate_vote_tabulate, response)
+
+
+def quarantined(response: basic.JSON) -> models.api.ReleaseUploadQuarantined | None:
+    # A quarantined upload gives a 202 response with no corresponding Results model
+    if isinstance(response, dict) and (response.get("quarantined") is True):
+        return validate(models.api.validate_release_upload_quarantined, response)
+    return None
+
+
+def sync[**P, R](
+    method: Callable[Concatenate[AsyncClient, P], Coroutine[Any, Any, R]],
+) -> Callable[P, R]:
+    @functools.wraps(method)
+    def wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
+        return web.run(method(AsyncClient(), *args, **kwargs))
+
+    return wrapper
+
+
+def validate[T](validator: models.api.Validator[T], response: bytes | basic.JSON) -> T:
+    # Every endpoint method validates through here, so direct AsyncClient use reports errors like the wrappers
     try:
-        response = api_instance.post(args)
-        if isinstance(response, dict) and (response.get("quarantined") is True):
-            return None
-        return models.api.validate_release_upload(response)
-    except (pydantic.ValidationError, models.api.ResultsTypeError) as e:
-        show.error_and_exit(f"Unexpected API POST response: {e}")
-
-
-@post("/sbom/generate")
-def sbom_generate(api: ApiPost, args: models.api.SbomGenerateArgs) -> models.api.SbomGenerateResults:
-    response = api.post(args)
-    return models.api.validate_sbom_generate(response)
-
-
-@post("/signature/provenance")
-def signature_provenance(
-    api: ApiPost, args: models.api.SignatureProvenanceArgs
-) -> models.api.SignatureProvenanceResults:
-    response = api.post(args)
-    return models.api.validate_signature_provenance(response)
-
-
-@post("/ssh-key/add")
-def ssh_key_add(api: ApiPost, args: models.api.SshKeyAddArgs) -> models.api.SshKeyAddResults:
-    response = api.post(args)
-    return models.api.validate_ssh_key_add(response)
-
-
-@post("/ssh-key/delete")
-def ssh_key_delete(api: ApiPost, args: models.api.SshKeyDeleteArgs) -> models.api.SshKeyDeleteResults:
-    response = api.post(args)
-    return models.api.validate_ssh_key_delete(response)
-
-
-@get("/ssh-keys/list")
-def ssh_keys_list(api: ApiGet, asf_uid: str) -> models.api.SshKeysListResults:
-    response = api.get(asf_uid)
-    return models.api.validate_ssh_keys_list(response)
-
-
-@get("/task/get", bearer=True)
-def task_get(api: ApiGet, task_id: str) -> models.api.TaskGetResults:
-    response = api.get(task_id)
-    return models.api.validate_task_get(response)
-
-
-@post("/vote/resolve")
-def vote_resolve(api: ApiPost, args: models.api.VoteResolveArgs) -> models.api.VoteResolveResults:
-    response = api.post(args)
-    return models.api.validate_vote_resolve(response)
-
-
-@post("/vote/start")
-def vote_start(api: ApiPost, args: models.api.VoteStartArgs) -> models.api.VoteStartResults:
-    response = api.post(args)
-    return models.api.validate_vote_start(response)
-
-
-@post("/vote/tabulate")
-def vote_tabulate(api: ApiPost, args: models.api.VoteTabulateArgs) -> models.api.VoteTabulateResults:
-    response = api.post(args)
-    return models.api.validate_vote_tabulate(response)
+        return validator.json(response) if isinstance(response, bytes) else validator(response)
+    except pydantic.ValidationError as e:
+        error_summary = "\n".join([f"  - {'.'.join(map(str, err['loc']))}: {err['msg']}" for err in e.errors()])
+        show.error_and_exit(f"API response failed validation:\n{error_summary}")
+
+
+checks_list = sync(AsyncClient.checks_list)
+checks_ongoing = sync(AsyncClient.checks_ongoing)
+committee_keys = sync(AsyncClient.committee_keys)
+distribution_list = sync(AsyncClient.distribution_list)
+distribution_record = sync(AsyncClient.distribution_record)
+ignore_add = sync(AsyncClient.ignore_add)
+ignore_delete = sync(AsyncClient.ignore_delete)
+ignore_list = sync(AsyncClient.ignore_list)
+key_add = sync(AsyncClient.key_add)
+key_delete = sync(AsyncClient.key_delete)
+key_get = sync(AsyncClient.key_get)
+keys_upload = sync(AsyncClient.keys_upload)
+keys_user = sync(AsyncClient.keys_user)
+project_get = sync(AsyncClient.project_get)
+project_releases = sync(AsyncClient.project_releases)
+quarantine_get = sync(AsyncClient.quarantine_get)
+release_announce = sync(AsyncClient.release_announce)
+release_attestable = sync(AsyncClient.release_attestable)
+release_create = sync(AsyncClient.release_create)
+release_delete = sync(AsyncClient.release_delete)
+release_draft_delete = sync(AsyncClient.release_draft_delete)
+release_get = sync(AsyncClient.release_get)
+release_patch = sync(AsyncClient.release_patch)
+release_paths = sync(AsyncClient.release_paths)
+release_revision = sync(AsyncClient.release_revision)
+release_revisions = sync(AsyncClient.release_revisions)
+release_signatures = sync(AsyncClient.release_signatures)
+release_upload = sync(AsyncClient.release_upload)
+release_upload_batch = sync(AsyncClient.release_upload_batch)
+release_upload_stream = sync(AsyncClient.release_upload_stream)
+sbom_generate = sync(AsyncClient.sbom_generate)
+signature_provenance = sync(AsyncClient.signature_provenance)
+ssh_key_add = sync(AsyncClient.ssh_key_add)
+ssh_key_delete = sync(AsyncClient.ssh_key_delete)
+ssh_keys_list = sync(AsyncClient.ssh_keys_list)
+task_get = sync(AsyncClient.task_get)
+vote_resolve = sync(AsyncClient.vote_resolve)
+vote_start = sync(AsyncClient.vote_start)
+vote_tabulate = sync(AsyncClient.vote_tabulate)
@@ -0,0 +1,131 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+from __future__ import annotations
+
+import contextlib
+import dataclasses
+import os
+import pathlib
+import sqlite3
+from typing import TYPE_CHECKING, Final
+
+import platformdirs
+
+import atrclient.models as models
+
+if TYPE_CHECKING:
+    from collections.abc import Generator, Iterable
+
+PATH_ENV: Final[str] = "ATR_CLIENT_CACHE_PATH"
+# Revisions are immutable, so the results for a revision are written once and never invalidated
+SCHEMA: Final[str] = """
+CREATE TABLE IF NOT EXISTS revision (
+    id INTEGER PRIMARY KEY,
+    host TEXT NOT NULL,
+    project TEXT NOT NULL,
+    version TEXT NOT NULL,
+    number TEXT NOT NULL,
+    UNIQUE (host, project, version, number)
+);
+CREATE TABLE IF NOT EXISTS check_result (
+    id INTEGER PRIMARY KEY,
+    revision_id INTEGER NOT NULL REFERENCES revision (id),
+    status TEXT NOT NULL,
+    checker TEXT NOT NULL,
+    primary_rel_path TEXT,
+    member_rel_path TEXT,
+    result TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS check_result_status ON check_result (revision_id, status);
+"""
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class Key:
+    # The host is part of the key, because the same release can exist on more than one server
+    host: str
+    project: str
+    version: str
+    number: str
+
+
+def checks_insert(connection: sqlite3.Connection, key: Key, checks: Iterable[models.view.CheckResult]) -> None:
+    with connection:
+        cursor = connection.execute(
+            "INSERT OR IGNORE INTO revision (host, project, version, number) VALUES (?, ?, ?, ?)",
+            dataclasses.astuple(key),
+        )
+        if cursor.rowcount == 0:
+            # Another process stored the same revision first
+            return
+        connection.executemany(
+            "INSERT INTO check_result (revision_id, status, checker, primary_rel_path, member_rel_path, result) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (
+                (
+                    cursor.lastrowid,
+                    check.status.value,
+                    check.checker,
+                    check.primary_rel_path,
+                    check.member_rel_path,
+                    check.model_dump_json(),
+                )
+                for check in checks
+            ),
+        )
+
+
+def checks_select(
+    connection: sqlite3.Connection, key: Key, status: models.view.CheckResultStatus | None = None
+) -> tuple[int, list[models.view.CheckResult]] | None:
+    # Returns the total number of results for the revision and those with the status, or None when not cached
+    # The results are in the order in which the server returned them
+    row = connection.execute(
+        "SELECT id FROM revision WHERE host = ? AND project = ? AND version = ? AND number = ?",
+        dataclasses.astuple(key),
+    ).fetchone()
+    if row is None:
+        return None
+    revision_id = row[0]
+    (total,) = connection.execute("SELECT COUNT(*) FROM check_result WHERE revision_id = ?", (revision_id,)).fetchone()
+    if status is None:
+        rows = connection.execute("SELECT result FROM check_result WHERE revision_id = ? ORDER BY id", (revision_id,))
+    else:
+        rows = connection.execute(
+            "SELECT result FROM check_result WHERE revision_id = ? AND status = ? ORDER BY id",
+            (revision_id, status.value),
+        )
+    return total, [models.view.CheckResult.model_validate_json(result) for (result,) in rows]
+
+
+@contextlib.contextmanager
+def connect() -> Generator[sqlite3.Connection]:
+    database_path = path()
+    database_path.parent.mkdir(parents=True, exist_ok=True)
+    connection = sqlite3.connect(database_path)
+    try:
+        connection.executescript(SCHEMA)
+        yield connection
+    finally:
+        connection.close()
+
+
+def path() -> pathlib.Path:
+    if env := os.getenv(PATH_ENV):
+        return pathlib.Path(env).expanduser()
+    return platformdirs.user_cache_path("atr", appauthor="ASF") / "checks.sqlite3"
@@ -15,46 +15,69 @@
 # specific language governing permissions and limitations
 # under the License.
 
-# TODO: Allow upload and download by calling rsync
-# Or potentially native for downloads, which should be trivial
-# There is also https://github.com/synodriver/pyrsync
-
 from __future__ import annotations
 
 import asyncio
 import base64
+import concurrent.futures
 import contextlib
+import dataclasses
 import datetime
+import fnmatch
 import getpass
+import glob
 import hashlib
 import importlib.metadata as metadata
-import io
 import json
+import math
+import multiprocessing
 import os
 import pathlib
 import re
 import signal
+import socket
 import sys
+import tempfile
 import time
 from typing import TYPE_CHECKING, Annotated, Any, Literal
 
 import cyclopts
-import jwt
-import pgpy
 
 import atrclient.api as api
 import atrclient.basic as basic
+import atrclient.cache as cache
 import atrclient.config as config
+import atrclient.diff as diff
+import atrclient.lazy as lazy
 import atrclient.models as models
+import atrclient.poll as poll
 import atrclient.show as show
-import atrclient.sign as sign
+import atrclient.tracker as tracker
 import atrclient.web as web
 
 if TYPE_CHECKING:
-    from collections.abc import Generator, Sequence
+    from collections.abc import Sequence, Set
 
+    import aiohttp
+    import blake3
+    import jwt
     import openpgp
 
+    import atrclient.agent as agent
+    import atrclient.delta as delta
+    import atrclient.sign as sign
+    import atrclient.verify as verify
+else:
+    aiohttp = lazy.module("aiohttp")
+    blake3 = lazy.module("blake3")
+    jwt = lazy.module("jwt")
+    openpgp = lazy.module("openpgp")
+    # Only the signing, verification, and sync commands need these, and they load openpgp and blake3
+    agent = lazy.module("atrclient.agent")
+    delta = lazy.module("atrclient.delta")
+    sign = lazy.module("atrclient.sign")
+    verify = lazy.module("atrclient.verify")
+
 APP: cyclopts.App = cyclopts.App()
 APP_API: cyclopts.App = cyclopts.App(name="api", help="API operations.")
 APP_CHECK: cyclopts.App = cyclopts.App(name="check", help="Check result operations.")
@@ -73,27 +96,11 @@ VERSION: str = metadata.version("apache-trusted-releases")
 
 type JSON = dict[str, Any] | list[Any] | str | int | float | bool | None
 
-CHECK_DETAIL_STATUSES: frozenset[models.sql.CheckResultStatus] = frozenset(
-    {
-        models.sql.CheckResultStatus.BLOCKER,
-        models.sql.CheckResultStatus.CONCERN,
-        models.sql.CheckResultStatus.EXCEPTION,
-        models.sql.CheckResultStatus.SUGGESTION,
-    }
-)
-
-
-class ForceUnexpiredOpenPGPKey(pgpy.PGPKey):
-    def __init__(self, *args: Any, **kwargs: Any) -> None:
-        super().__init__(*args, **kwargs)
-
-    def __iter__(self) -> Generator[pgpy.PGPKey]:
-        # Just for the type checker
-        yield self
-
-    @property
-    def is_expired(self) -> bool:
-        return False
+AGENT_TTL_DEFAULT: float = 15 * 60
+# Values of models.view.CheckResultStatus, spelled out so that startup does not import pydantic
+CHECK_DETAIL_STATUSES: frozenset[str] = frozenset({"blocker", "concern", "exception", "suggestion"})
+CHECKSUM_ALGORITHMS: tuple[str, ...] = ("sha256", "sha512")
+SIDECAR_SUFFIXES: tuple[str, ...] = (".asc", ".md5", ".sha1", ".sha256", ".sha512")
 
 
 @APP.command(name="announce", help="Announce a release.")
@@ -161,7 +168,7 @@ def app_api_get(path: str) -> None:
     jwt_value = config.jwt_usable()
     host, verify_ssl = config.host_get()
     url = f"https://{host}/api{path}"
-    json_data = asyncio.run(web.get(url, jwt_value, verify_ssl))
+    json_data = web.json_parse(web.run(web.get(url, jwt_value, verify_ssl)))
     # Always show JSON output
     show.json_or_message(json_data)
 
@@ -182,7 +189,7 @@ def app_api_post(path: str, /, **kwargs: str) -> None:
         show.error_and_exit(f"Unexpected API request payload type: {kwargs}")
     if not basic.is_json_dict(kwargs):
         show.error_and_exit(f"Unexpected API request payload type: {kwargs}")
-    json_data = asyncio.run(web.post_json(url, kwargs, jwt_value, verify_ssl))
+    json_data = web.json_parse(web.run(web.post_json(url, kwargs, jwt_value, verify_ssl)))
     # Always show JSON output
     show.json_or_message(json_data)
 
@@ -195,13 +202,9 @@ def app_check_blockers(
     revision: str | None = None,
     members: Annotated[bool, cyclopts.Parameter(alias="-m", name="--members")] = False,
 ) -> None:
-    checks_list = api.checks_list(project, version, revision=revision)
-    checks_display_status(
-        models.sql.CheckResultStatus.BLOCKER,
-        checks_list.checks,
-        checks_list.checks_revision,
-        members=members,
-    )
+    status = models.view.CheckResultStatus.BLOCKER
+    checks_revision, total, results = checks_fetch(project, version, revision, status)
+    checks_display_status(status, results, total, checks_revision, members=members)
 
 
 @APP_CHECK.command(name="concerns", help="Get check concerns for the latest or specified release revision.")
@@ -212,14 +215,22 @@ def app_check_concerns(
     revision: str | None = None,
     members: Annotated[bool, cyclopts.Parameter(alias="-m", name="--members")] = False,
 ) -> None:
-    checks_list = api.checks_list(project, version, revision=revision)
-    checks_display_status(
-        models.sql.CheckResultStatus.CONCERN,
-        checks_list.checks,
-        checks_list.checks_revision,
-        members=members,
-    )
-    checks_display_concern_groups(checks_list.checks)
+    status = models.view.CheckResultStatus.CONCERN
+    checks_revision, total, results = checks_fetch(project, version, revision, status)
+    checks_display_status(status, results, total, checks_revision, members=members)
+    checks_display_concern_groups(results)
+
+
+@APP_CHECK.command(name="diff", help="Compare the check results of two release revisions.")
+def app_check_diff(project: str, version: str, revision_a: str, revision_b: str, /) -> None:
+    before, after = web.run(checks_fetch_pair(project, version, revision_a, revision_b))
+    changes = diff.checks(before, after)
+    if not any(changes.values()):
+        print(f"No check result differences between revisions {revision_a} and {revision_b}.")
+        return
+    for status, status_changes in changes.items():
+        if status_changes:
+            checks_diff_display(status, status_changes)
 
 
 @APP_CHECK.command(name="exceptions", help="Get check exceptions for the latest or specified release revision.")
@@ -230,13 +241,9 @@ def app_check_exceptions(
     revision: str | None = None,
     members: Annotated[bool, cyclopts.Parameter(alias="-m", name="--members")] = False,
 ) -> None:
-    checks_list = api.checks_list(project, version, revision=revision)
-    checks_display_status(
-        models.sql.CheckResultStatus.EXCEPTION,
-        checks_list.checks,
-        checks_list.checks_revision,
-        members=members,
-    )
+    status = models.view.CheckResultStatus.EXCEPTION
+    checks_revision, total, results = checks_fetch(project, version, revision, status)
+    checks_display_status(status, results, total, checks_revision, members=members)
 
 
 @APP_CHECK.command(name="notes", help="Get check notes for the latest or specified release revision.")
@@ -247,13 +254,9 @@ def app_check_notes(
     revision: str | None = None,
     members: Annotated[bool, cyclopts.Parameter(alias="-m", name="--members")] = False,
 ) -> None:
-    checks_list = api.checks_list(project, version, revision=revision)
-    checks_display_status(
-        models.sql.CheckResultStatus.NOTE,
-        checks_list.checks,
-        checks_list.checks_revision,
-        members=members,
-    )
+    status = models.view.CheckResultStatus.NOTE
+    checks_revision, total, results = checks_fetch(project, version, revision, status)
+    checks_display_status(status, results, total, checks_revision, members=members)
 
 
 @APP_CHECK.command(name="status", help="Get check status for a release revision.")
@@ -279,8 +282,8 @@ def app_check_status(
             show.error_and_exit(f"Unexpected API response: {release.latest_revision_number}")
         revision = release.latest_revision_number
 
-    checks_list = api.checks_list(project, version, revision)
-    checks_display(checks_list.checks, verbose)
+    _checks_revision, _total, results = checks_fetch(project, version, revision)
+    checks_display(results, verbose)
 
 
 @APP_CHECK.command(name="suggestions", help="Get check suggestions for the latest or specified release revision.")
@@ -291,13 +294,9 @@ def app_check_suggestions(
     revision: str | None = None,
     members: Annotated[bool, cyclopts.Parameter(alias="-m", name="--members")] = False,
 ) -> None:
-    checks_list = api.checks_list(project, version, revision=revision)
-    checks_display_status(
-        models.sql.CheckResultStatus.SUGGESTION,
-        checks_list.checks,
-        checks_list.checks_revision,
-        members=members,
-    )
+    status = models.view.CheckResultStatus.SUGGESTION
+    checks_revision, total, results = checks_fetch(project, version, revision, status)
+    checks_display_status(status, results, total, checks_revision, members=members)
 
 
 @APP_CHECK.command(name="wait", help="Wait for checks to be completed.")
@@ -308,6 +307,8 @@ def app_check_wait(
     revision: str | None = None,
     timeout: Annotated[float, cyclopts.Parameter(alias="-t", name="--timeout")] = 60,
     interval: Annotated[int, cyclopts.Parameter(alias="-i", name="--interval")] = 500,
+    max_interval: Annotated[int, cyclopts.Parameter(name="--max-interval")] = 10_000,
+    stream: bool = False,
 ) -> None:
     _host, verify_ssl = config.host_get()
     if verify_ssl is True:
@@ -316,14 +317,13 @@ def app_check_wait(
     interval_seconds = interval / 1000
     if interval_seconds > timeout:
         show.error_and_exit("Interval must be less than timeout.")
-    while True:
-        checks_ongoing = api.checks_ongoing(project, version, revision)
-        if checks_ongoing.ongoing == 0:
-            break
-        time.sleep(interval_seconds)
-        timeout -= interval_seconds
-        if timeout <= 0:
-            show.error_and_exit("Timeout waiting for checks to complete.")
+    if max_interval < interval:
+        show.error_and_exit("Maximum interval must be at least the interval.")
+    backoff = poll.Backoff(interval_seconds, max_interval / 1000)
+    completed = web.run(checks_wait(project, version, revision, poll.Deadline(timeout), backoff, stream))
+    show.progress_end()
+    if not completed:
+        show.error_and_exit("Timeout waiting for checks to complete.")
     print("Checks completed.")
 
 
@@ -563,9 +563,51 @@ def app_docs() -> None:
 
 
 @APP.command(name="download", help="Download a file from a release.")
-def app_download(project: str, version: str, path: str, target: str = ".", /) -> None:
-    saved = release_file_download(project, version, path, target)
+def app_download(
+    project: str,
+    version: str,
+    path: str,
+    target: str = ".",
+    /,
+    segments: int = 1,
+    chunk_size: int = web.DOWNLOAD_CHUNK_SIZE,
+) -> None:
+    if segments < 1:
+        show.error_and_exit("The number of segments must be at least 1.")
+    if chunk_size < 1:
+        show.error_and_exit("The chunk size must be at least 1.")
+    started = time.monotonic()
+    saved, received = release_file_download(project, version, path, target, segments, chunk_size)
+    elapsed = time.monotonic() - started
+    rate = (received / elapsed / (1024 * 1024)) if elapsed else 0
     print(f"Downloaded to {saved}")
+    print(f"Received {received} bytes in {elapsed:.2f} seconds ({rate:.2f} MiB/s)")
+
+
+@APP.command(
+    name="download-release", help="Download all files in a release, checking each against its .sha512 sibling."
+)
+def app_download_release(
+    project: str,
+    version: str,
+    directory: str,
+    /,
+    jobs: int = 8,
+    chunk_size: int = web.DOWNLOAD_CHUNK_SIZE,
+) -> None:
+    if jobs < 1:
+        show.error_and_exit("The number of jobs must be at least 1.")
+
+    rel_paths = api.release_paths(project, version).rel_paths
+    root = pathlib.Path(directory)
+    results = web.run(release_files_download(project, version, rel_paths, root, jobs, chunk_size))
+    failed = [rel_path for rel_path, status in results.items() if status != "OK"]
+    checksums = {f"{rel_path}.sha512" for rel_path in results}
+    unchecked = [rel_path for rel_path in rel_paths if (rel_path not in results) and (rel_path not in checksums)]
+    verified = len(results) - len(failed)
+    print(f"Downloaded {len(rel_paths)} files to {root}: {verified} verified, {len(unchecked)} unchecked")
+    if failed:
+        show.error_and_exit(f"{len(failed)} files failed SHA-512 verification: {', '.join(sorted(failed))}")
 
 
 @APP.command(name="drop", help="Remove a configuration key using dot notation.")
@@ -591,7 +633,7 @@ def app_ignore_add(
     checker: str | None = None,
     primary_rel_path: str | None = None,
     member_rel_path: str | None = None,
-    status: models.sql.CheckResultStatusIgnore | None = None,
+    status: Literal["concern", "exception", "suggestion"] | None = None,
     message: str | None = None,
 ) -> None:
     args = models.api.IgnoreAddArgs(
@@ -601,7 +643,7 @@ def app_ignore_add(
         checker_glob=checker,
         primary_rel_path_glob=primary_rel_path,
         member_rel_path_glob=member_rel_path,
-        status=status,
+        status=(models.sql.CheckResultStatusIgnore(status) if (status is not None) else None),
         message_glob=message,
     )
     api.ignore_add(args)
@@ -773,17 +815,11 @@ def app_revisions(project: str, version: str, /) -> None:
         print(revision)
 
 
-@APP.command(name="rsync", help="Rsync a release.")
+@APP.command(name="rsync", help="Rsync a release, sending only changed blocks of existing files.")
 def app_rsync(project: str, version: str, source: str = ".", target: str = "/", /) -> None:
-    import subprocess
-
-    with config.lock() as cfg:
-        asf_uid = config.get(cfg, ["asf", "uid"])
-    if asf_uid is None:
-        show.error_and_exit("Please configure asf.uid before uploading.")
-
-    if not source.endswith("/"):
-        source += "/"
+    source_path = pathlib.Path(source)
+    if not source_path.is_dir():
+        show.error_and_exit(f"Not a directory: {source}")
 
     if target.startswith("./"):
         target = target[2:]
@@ -793,32 +829,31 @@ def app_rsync(project: str, version: str, source: str = ".", target: str = "/",
         # Must not do this if target is empty
         target += "/"
 
-    host, _verify_ssl = config.host_get()
-    if ":" in host:
-        host, _port = host.split(":", 1)
-    remote_target = f"{asf_uid}@{host}:/{project}/{version}/{target}"
-    cmd = ["rsync", "-av", "-e", "ssh -p 2222", source, remote_target]
-    subprocess.run(cmd, check=True)
+    stats = web.run(rsync_run(project, version, source_path, target))
+    saved = (100 * stats.bytes_copied / stats.bytes_total) if stats.bytes_total else 0
+    print(
+        f"Synced {stats.files} files ({stats.files_skipped} unchanged):"
+        f" sent {stats.bytes_sent} bytes, matched {stats.bytes_copied} bytes ({saved:.1f}% saved)"
+    )
 
 
-@APP_SBOM.command(name="generate", help="Generate and augment a CycloneDX SBOM for a release artifact.")
+@APP_SBOM.command(name="generate", help="Generate and augment CycloneDX SBOMs for release artifacts.")
 def app_sbom_generate(
     project: str,
     version: str,
-    path: str,
     /,
+    *paths: str,
     wait: bool = False,
     timeout: float = 600,
 ) -> None:
-    generate_args = models.api.SbomGenerateArgs(
-        project=models.safe.ProjectKey(project),
-        version=models.safe.VersionKey(version),
-        relpath=models.safe.RelPath(path),
-    )
-    task = api.sbom_generate(generate_args).task
-    if wait:
-        task = task_wait(task, timeout)
-    print(task.model_dump_json(indent=None))
+    if not paths:
+        show.error_and_exit("At least one path or glob is required.")
+    rel_paths = sbom_rel_paths(project, version, paths)
+    if not rel_paths:
+        show.error_and_exit("No release paths match.")
+    unfinished = web.run(sbom_generate(project, version, rel_paths, wait, timeout))
+    if unfinished:
+        show.error_and_exit(f"{unfinished} of {len(rel_paths)} SBOM tasks did not complete.")
 
 
 @APP.command(name="set", help="Set a configuration value using dot notation.")
@@ -871,45 +906,101 @@ def app_sign(
     /,
     key: str | None = None,
     upload: bool = False,
+    checksums: bool = False,
 ) -> None:
     secret_key, component = signing_component_load(key)
     expected_revision = None
     if upload:
         committee_key_check(project, secret_key.fingerprint)
         expected_revision = api.release_get(project, version).release.latest_revision_number
-    password = signing_password_read(secret_key, component)
+    # A running sign agent already holds the unlocked key, so there is no passphrase to read
+    use_agent = agent.holds(secret_key.fingerprint)
+    password = None if use_agent else signing_password_read(secret_key, component)
 
-    file_path = release_file_download(project, version, path, target)
+    file_path, _received = release_file_download(project, version, path, target)
+    algorithms = CHECKSUM_ALGORITHMS if checksums else ()
     try:
-        armored = sign.sign_detached(file_path.read_bytes(), component, password)
+        if use_agent:
+            armored, digests = agent.sign_file(file_path, algorithms)
+        else:
+            armored, digests = sign.sign_detached_digests(file_path, component, password, algorithms)
     except ValueError as e:
         show.error_and_exit(f"Signing failed: {e}")
 
-    asc_path = file_path.with_name(file_path.name + ".asc")
-    try:
-        with asc_path.open("x", encoding="utf-8") as asc_file:
-            asc_file.write(armored)
-    except FileExistsError:
-        show.error_and_exit(f"File already exists: {asc_path}")
-    except BaseException:
-        asc_path.unlink(missing_ok=True)
-        raise
-
+    sidecars = {".asc": armored}
+    for algorithm, digest in digests.items():
+        sidecars[f".{algorithm}"] = f"{digest}  {file_path.name}\n"
+    sidecars_write(file_path, sidecars)
     if not upload:
-        print(f"Signed to {asc_path}")
+        print(f"Signed to {file_path.with_name(file_path.name + '.asc')}")
+        for algorithm in digests:
+            print(f"Wrote {file_path.with_name(f'{file_path.name}.{algorithm}')}")
         return
+    sidecars_upload(project, version, path, sidecars, expected_revision)
 
-    upload_args = models.api.ReleaseUploadArgs(
-        project=models.safe.ProjectKey(project),
-        version=models.safe.VersionKey(version),
-        relpath=models.safe.RelPath(path + ".asc"),
-        content=base64.b64encode(armored.encode("utf-8")).decode("utf-8"),
-        expected_revision=(models.safe.RevisionNumber(expected_revision) if (expected_revision is not None) else None),
+
+@APP.command(name="sign-agent", help="Hold an unlocked signing key in memory for atr sign to use.")
+def app_sign_agent(key: str | None = None, ttl: float = AGENT_TTL_DEFAULT, stop: bool = False) -> None:
+    if not hasattr(socket, "AF_UNIX"):
+        show.error_and_exit("The sign agent needs Unix domain socket support.")
+    if stop:
+        if not agent.stop():
+            show.error_and_exit("The sign agent is not running.")
+        print("Stopped the sign agent")
+        return
+    if agent.request({"op": "ping"}) is not None:
+        show.error_and_exit(f"A sign agent is already running at {agent.socket_path()}")
+
+    secret_key, component = signing_component_load(key)
+    password = signing_password_read(secret_key, component)
+    path = agent.socket_path()
+    print(f"Serving key {secret_key.fingerprint.upper()} at {path} for {ttl:g} seconds")
+    asyncio.run(agent.Agent(secret_key.fingerprint, component, password).serve(path, ttl))
+
+
+@APP.command(name="sign-release", help="Sign every unsigned artifact in a release, and upload the signatures together.")
+def app_sign_release(
+    project: str,
+    version: str,
+    /,
+    key: str | None = None,
+    directory: str | None = None,
+    jobs: int = 4,
+) -> None:
+    if jobs < 1:
+        show.error_and_exit("The number of jobs must be at least 1.")
+    secret_key, component = signing_component_load(key)
+    committee_key_check(project, secret_key.fingerprint)
+    expected_revision = api.release_get(project, version).release.latest_revision_number
+    release_paths = set(api.release_paths(project, version, expected_revision).rel_paths)
+    rel_paths = sorted(
+        rel_path
+        for rel_path in release_paths
+        if (not rel_path.endswith(SIDECAR_SUFFIXES)) and (f"{rel_path}.asc" not in release_paths)
     )
-    uploaded = api.release_upload(upload_args)
-    if uploaded is None:
-        show.error_and_exit("Unexpected quarantine of the uploaded signature.")
-    print(uploaded.revision.model_dump_json(indent=None))
+    if not rel_paths:
+        print(f"Every artifact in {project} {version} is already signed.")
+        return
+    password = signing_password_read(secret_key, component)
+
+    with contextlib.ExitStack() as stack:
+        if directory is None:
+            root = pathlib.Path(stack.enter_context(tempfile.TemporaryDirectory(prefix="atr-sign-")))
+        else:
+            root = pathlib.Path(directory)
+        # Artifacts kept in the directory by an earlier run are reused when they match the release
+        existing = web.run(release_files_existing(project, version, rel_paths, release_paths, root))
+        missing = [rel_path for rel_path in rel_paths if rel_path not in existing]
+        web.run(release_files_download(project, version, missing, root, jobs, web.DOWNLOAD_CHUNK_SIZE))
+        signatures = release_files_sign(secret_key, component, password, root, rel_paths, jobs)
+        if directory is not None:
+            for rel_path, armored in signatures.items():
+                (root / f"{rel_path}.asc").write_text(armored, encoding="utf-8")
+
+    texts = {f"{rel_path}.asc": armored for rel_path, armored in signatures.items()}
+    revision = release_upload_texts(project, version, texts, expected_revision)
+    print(f"Signed {len(signatures)} artifacts")
+    print(revision.model_dump_json(indent=None))
 
 
 @APP_SSH.command(name="add", help="Add an SSH key.")
@@ -939,22 +1030,54 @@ def app_ssh_list(asf_uid: str | None = None) -> None:
 
 @APP.command(name="upload", help="Upload a file to a release.")
 def app_upload(project: str, version: str, path: str, filepath: str, /) -> None:
-    with open(filepath, "rb") as fh:
-        content = fh.read()
-
-    upload_args = models.api.ReleaseUploadArgs(
-        project=models.safe.ProjectKey(project),
-        version=models.safe.VersionKey(version),
-        relpath=models.safe.RelPath(path),
-        content=base64.b64encode(content).decode("utf-8"),
-    )
+    upload_path = pathlib.Path(filepath)
+    if not upload_path.is_file():
+        show.error_and_exit(f"File not found: {filepath}")
 
     revision_before = api.release_get(project, version).release.latest_revision_number
-    upload = api.release_upload(upload_args)
-    if upload is not None:
-        print(upload.revision.model_dump_json(indent=None))
+    upload = web.run(upload_file(api.AsyncClient(), project, version, path, upload_path))
+    if isinstance(upload, models.api.ReleaseUploadQuarantined):
+        revision = upload_quarantine_wait(project, version, [upload.token], revision_before, 1)
+    else:
+        revision = upload.revision
+    print(revision.model_dump_json(indent=None))
+
+
+@APP.command(name="upload-dir", help="Upload new or changed files in a directory to a release.")
+def app_upload_dir(project: str, version: str, directory: str, /, jobs: int = 4, timeout: float = 300) -> None:
+    root = pathlib.Path(directory)
+    if not root.is_dir():
+        show.error_and_exit(f"Not a directory: {directory}")
+    if jobs < 1:
+        show.error_and_exit("The number of jobs must be at least 1.")
+
+    paths = sorted(path for path in root.rglob("*") if path.is_file())
+    # The default fork start method may deadlock when a thread of this process, such as a resolver, holds a lock
+    context = multiprocessing.get_context("spawn")
+    with concurrent.futures.ProcessPoolExecutor(mp_context=context) as executor:
+        hashes = dict(zip(paths, executor.map(content_hash, paths, chunksize=8), strict=True))
+
+    local = [path.relative_to(root).as_posix() for path in paths]
+    rel_paths, attested = web.run(upload_dir_state(project, version, local, jobs))
+    changed = []
+    for path, path_hash in hashes.items():
+        rel_path = path.relative_to(root).as_posix()
+        if (rel_path not in rel_paths) or (attested.get(rel_path) != path_hash):
+            changed.append((rel_path, path))
+    if not changed:
+        print(f"All {len(paths)} files are unchanged.")
         return
-    revision = upload_quarantine_wait(project, version, revision_before)
+
+    revision_before = api.release_get(project, version).release.latest_revision_number
+    uploads = web.run(upload_dir_files(project, version, changed, jobs))
+    print(f"Uploaded {len(changed)} of {len(paths)} files.")
+    revisions = [upload.revision for upload in uploads if isinstance(upload, models.api.ReleaseUploadResults)]
+    tokens = [upload.token for upload in uploads if isinstance(upload, models.api.ReleaseUploadQuarantined)]
+    if tokens:
+        revisions.append(
+            upload_quarantine_wait(project, version, tokens, revision_before, len(uploads), timeout=timeout)
+        )
+    revision = max(revisions, key=lambda r: r.seq)
     print(revision.model_dump_json(indent=None))
 
 
@@ -981,43 +1104,89 @@ def app_verify(url: str, /, verbose: bool = False) -> None:
     print_if_verbose("")
 
     print_if_verbose("We will now download the artifact and then the signature from these URLs.\n")
-    artifact_data = asyncio.run(web.get_url(artifact_url, verify_ssl=False))
-    signature_data = asyncio.run(web.get_url(signature_url, verify_ssl=False))
-    if not signature_data:
-        show.error_and_exit(f"Signature is empty: {signature_url}")
-    artifact_hash = hashlib.sha3_256(artifact_data).hexdigest()
-    signature_hash = hashlib.sha3_256(signature_data).hexdigest()
-    print_if_verbose(f"The artifact file is {len(artifact_data):,} bytes in size, and its SHA3-256 is:\n")
-    print_if_verbose(artifact_hash + "\n")
-    print_if_verbose(f"The signature file is {len(signature_data):,} bytes in size, and its SHA3-256 is:\n")
-    print_if_verbose(signature_hash)
-    print_if_verbose("")
-
-    signature_asc_text = signature_data.decode("utf-8", errors="ignore")
-    signature_file_name = signature_url.split("/")[-1]
-
-    print_if_verbose("To verify the signature, we need the OpenPGP signing key from the ATR.\n")
-    verify_provenance_args = models.api.SignatureProvenanceArgs(
-        signature_file_name=signature_file_name,
-        signature_asc_text=signature_asc_text,
-        signature_sha3_256=signature_hash,
-    )
-    print_if_verbose("To get the key, we are going to send the following API request:\n")
-    dumped_json = verify_provenance_args.model_dump()
-    dumped_json["signature_asc_text"] = dumped_json["signature_asc_text"][:32] + "..."
-    print_if_verbose(json.dumps(dumped_json, indent=2))
-    print_if_verbose("")
-    verify_provenance = api.signature_provenance(verify_provenance_args)
-    print_if_verbose("The ATR found a matching OpenPGP key with the following fingerprint:\n")
-    print_if_verbose(verify_provenance.fingerprint.upper() + "\n")
-    print_if_verbose("This key is associated with these committees with a project containing the artifact:\n")
-    for committee_with_artifact in verify_provenance.committees_with_artifact:
-        print_if_verbose(f"-- {committee_with_artifact.committee}")
-    print_if_verbose("")
-
-    print_if_verbose("We can now try to verify the signature using the OpenPGP key from the ATR.\n")
-    print_if_verbose("Note that we ignore key expiry, so we consider expired key signatures to be valid.\n")
-    verify_summary(verify_provenance, signature_data, artifact_data, verbose)
+    with tempfile.TemporaryDirectory(prefix="atr-verify-") as temporary:
+        # The artifact is streamed to disk and hashed as it arrives, so memory use does not depend on its size
+        artifact_path = pathlib.Path(temporary) / "artifact"
+        artifact_sha3 = hashlib.sha3_256()
+        with artifact_path.open("wb") as artifact_file:
+            artifact_size = web.run(web.get_url_stream(artifact_url, artifact_file, update=artifact_sha3.update))
+        signature_data = web.run(web.get_url(signature_url))
+        if not signature_data:
+            show.error_and_exit(f"Signature is empty: {signature_url}")
+        artifact_hash = artifact_sha3.hexdigest()
+        signature_hash = hashlib.sha3_256(signature_data).hexdigest()
+        print_if_verbose(f"The artifact file is {artifact_size:,} bytes in size, and its SHA3-256 is:\n")
+        print_if_verbose(artifact_hash + "\n")
+        print_if_verbose(f"The signature file is {len(signature_data):,} bytes in size, and its SHA3-256 is:\n")
+        print_if_verbose(signature_hash)
+        print_if_verbose("")
+
+        signature_asc_text = signature_data.decode("utf-8", errors="ignore")
+        signature_file_name = signature_url.split("/")[-1]
+
+        print_if_verbose("To verify the signature, we need the OpenPGP signing key from the ATR.\n")
+        verify_provenance_args = models.api.SignatureProvenanceArgs(
+            signature_file_name=signature_file_name,
+            signature_asc_text=signature_asc_text,
+            signature_sha3_256=signature_hash,
+        )
+        print_if_verbose("To get the key, we are going to send the following API request:\n")
+        dumped_json = verify_provenance_args.model_dump()
+        dumped_json["signature_asc_text"] = dumped_json["signature_asc_text"][:32] + "..."
+        print_if_verbose(json.dumps(dumped_json, indent=2))
+        print_if_verbose("")
+        verify_provenance = api.signature_provenance(verify_provenance_args)
+        print_if_verbose("The ATR found a matching OpenPGP key with the following fingerprint:\n")
+        print_if_verbose(verify_provenance.fingerprint.upper() + "\n")
+        print_if_verbose("This key is associated with these committees with a project containing the artifact:\n")
+        for committee_with_artifact in verify_provenance.committees_with_artifact:
+            print_if_verbose(f"-- {committee_with_artifact.committee}")
+        print_if_verbose("")
+
+        print_if_verbose("We can now try to verify the signature using the OpenPGP key from the ATR.\n")
+        print_if_verbose("Note that we ignore key expiry, so we consider expired key signatures to be valid.\n")
+        verify_summary(verify_provenance, signature_data, artifact_path, verbose)
+
+
+@APP.command(name="verify-dir", help="Verify every artifact in a directory that has an .asc signature.")
+def app_verify_dir(
+    directory: str,
+    /,
+    jobs: int = 4,
+    as_json: Annotated[bool, cyclopts.Parameter(name="--json")] = False,
+) -> None:
+    if jobs < 1:
+        show.error_and_exit("The number of jobs must be at least 1.")
+    root = pathlib.Path(directory)
+    if not root.is_dir():
+        show.error_and_exit(f"Not a directory: {directory}")
+    rel_paths = verify.pairs(root)
+    if not rel_paths:
+        show.error_and_exit(f"No signed artifacts found in {directory}")
+    verify_outcomes_display(verify.run(root, rel_paths, jobs), as_json)
+
+
+@APP.command(name="verify-release", help="Download and verify every signed artifact in a release.")
+def app_verify_release(
+    project: str,
+    version: str,
+    /,
+    revision: str | None = None,
+    jobs: int = 4,
+    as_json: Annotated[bool, cyclopts.Parameter(name="--json")] = False,
+) -> None:
+    if jobs < 1:
+        show.error_and_exit("The number of jobs must be at least 1.")
+    release_paths = set(api.release_paths(project, version, revision).rel_paths)
+    rel_paths = sorted(rel_path for rel_path in release_paths if f"{rel_path}.asc" in release_paths)
+    if not rel_paths:
+        show.error_and_exit(f"No signed artifacts found in {project} {version}")
+    downloads = [name for rel_path in rel_paths for name in (rel_path, f"{rel_path}.asc")]
+    with tempfile.TemporaryDirectory(prefix="atr-verify-") as temporary:
+        root = pathlib.Path(temporary)
+        web.run(release_files_download(project, version, downloads, root, jobs, web.DOWNLOAD_CHUNK_SIZE))
+        outcomes = verify.run(root, rel_paths, jobs)
+    verify_outcomes_display(outcomes, as_json)
 
 
 @APP_VOTE.command(name="resolve", help="Resolve a vote.")
@@ -1128,12 +1297,26 @@ def app_vote_tabulate(project: str, version: str, /) -> None:
     print(vote_tabulate.model_dump_json(indent=2))
 
 
-def checks_display(results: Sequence[models.sql.CheckResult], verbose: bool = False) -> None:
+def checks_cache_enabled() -> bool:
+    with config.lock() as cfg:
+        return config.get(cfg, ["cache", "checks"]) is True
+
+
+def checks_diff_display(status: models.view.CheckResultStatus, changes: diff.Changes) -> None:
+    print(f"{status.value}: {len(changes.added)} added, {len(changes.removed)} removed, {len(changes.changed)} changed")
+    lines = [f"  + {checks_line(check)}" for check in changes.added]
+    lines.extend(f"  - {checks_line(check)}" for check in changes.removed)
+    lines.extend(f"  ~ {checks_line(check)} (was {old.status.value})" for old, check in changes.changed)
+    for line in sorted(lines):
+        print(line)
+
+
+def checks_display(results: Sequence[models.view.CheckResult], verbose: bool = False) -> None:
     if not results:
         print("No check results found for this revision.")
         return
 
-    by_status: dict[str, list[models.sql.CheckResult]] = {}
+    by_status: dict[str, list[models.view.CheckResult]] = {}
     for result in results:
         status = result.status
         by_status.setdefault(status, []).append(result)
@@ -1142,10 +1325,10 @@ def checks_display(results: Sequence[models.sql.CheckResult], verbose: bool = Fa
     checks_display_details(by_status, verbose)
 
 
-def checks_display_concern_groups(results: Sequence[models.sql.CheckResult]) -> None:
+def checks_display_concern_groups(results: Sequence[models.view.CheckResult]) -> None:
     counts: dict[str, int] = {}
     for result in results:
-        if result.status != models.sql.CheckResultStatus.CONCERN:
+        if result.status != models.view.CheckResultStatus.CONCERN:
             continue
         checker = result.checker or ""
         counts[checker] = counts.get(checker, 0) + 1
@@ -1156,7 +1339,7 @@ def checks_display_concern_groups(results: Sequence[models.sql.CheckResult]) ->
         print(f" - {checker} ({counts[checker]})")
 
 
-def checks_display_details(by_status: dict[str, list[models.sql.CheckResult]], verbose: bool) -> None:
+def checks_display_details(by_status: dict[str, list[models.view.CheckResult]], verbose: bool) -> None:
     if not verbose:
         return
     for status_key in by_status.keys():
@@ -1167,34 +1350,31 @@ def checks_display_details(by_status: dict[str, list[models.sql.CheckResult]], v
 
 
 def checks_display_status(
-    status: models.sql.CheckResultStatus,
-    results: Sequence[models.sql.CheckResult],
-    revision: models.safe.RevisionNumber,
+    status: models.view.CheckResultStatus,
+    results: Sequence[models.view.CheckResult],
+    total: int,
+    revision: str,
     members: bool,
 ) -> None:
-    if not results:
+    # The results all have the status, and the total counts results of every status
+    if not total:
         print(f"No check results found for revision {revision}.")
         return
 
-    matching_results = [result for result in results if result.status == status]
-    if not matching_results:
+    if not results:
         print(f"No {status.value} check results found for revision {revision}.")
         return
 
     messages: dict[str, list[str]] = {}
     hidden_member_count = 0
-    for result in matching_results:
+    for result in results:
         member_rel_path = result.member_rel_path
         if member_rel_path and (not members):
             hidden_member_count += 1
             continue
         checker = result.checker or ""
         message = result.message
-        primary_rel_path = result.primary_rel_path or "(release)"
-        if not member_rel_path:
-            path = primary_rel_path
-        else:
-            path = f"{primary_rel_path} → {member_rel_path}"
+        path = checks_path(result)
 
         if path not in messages:
             messages[path] = []
@@ -1214,7 +1394,7 @@ def checks_display_status(
         print()
 
 
-def checks_display_summary(by_status: dict[str, list[models.sql.CheckResult]], verbose: bool, total: int) -> None:
+def checks_display_summary(by_status: dict[str, list[models.view.CheckResult]], verbose: bool, total: int) -> None:
     print(f"Total checks: {total}")
     for status, checks in by_status.items():
         if verbose and status in CHECK_DETAIL_STATUSES:
@@ -1225,7 +1405,7 @@ def checks_display_summary(by_status: dict[str, list[models.sql.CheckResult]], v
             print(f"  {status}: {len(checks)}")
 
 
-def checks_display_verbose_details(checks: Sequence[models.sql.CheckResult]) -> None:
+def checks_display_verbose_details(checks: Sequence[models.view.CheckResult]) -> None:
     for check in checks[:10]:
         checker = check.checker or ""
         primary_rel_path = check.primary_rel_path or ""
@@ -1235,6 +1415,132 @@ def checks_display_verbose_details(checks: Sequence[models.sql.CheckResult]) ->
         print(f"  {checker} → {primary_rel_path}{member_part} : {message}")
 
 
+def checks_fetch(
+    project: str, version: str, revision: str | None, status: models.view.CheckResultStatus | None = None
+) -> tuple[str, int, list[models.view.CheckResult]]:
+    if checks_cache_enabled():
+        return web.run(checks_fetch_cached(project, version, revision, status))
+    checks_list = api.checks_list(project, version, revision=revision)
+    results = [check for check in checks_list.checks if (status is None) or (check.status == status)]
+    return str(checks_list.checks_revision), len(checks_list.checks), results
+
+
+async def checks_fetch_cached(
+    project: str, version: str, revision: str | None, status: models.view.CheckResultStatus | None
+) -> tuple[str, int, list[models.view.CheckResult]]:
+    async with api.AsyncClient() as atr:
+        if revision is None:
+            revision = (await atr.release_get(project, version)).release.latest_revision_number
+            if not isinstance(revision, str):
+                show.error_and_exit("No revision number found.")
+        key = cache.Key(config.host_get()[0], project, version, revision)
+        with cache.connect() as connection:
+            if (selected := cache.checks_select(connection, key, status)) is not None:
+                total, results = selected
+                return revision, total, results
+            checks_list, ongoing = await asyncio.gather(
+                atr.checks_list(project, version, revision),
+                atr.checks_ongoing(project, version, revision),
+            )
+            # The results of a revision are only complete once its checks have finished
+            if ongoing.ongoing == 0:
+                cache.checks_insert(connection, key, checks_list.checks)
+    results = [check for check in checks_list.checks if (status is None) or (check.status == status)]
+    return str(checks_list.checks_revision), len(checks_list.checks), results
+
+
+async def checks_fetch_pair(
+    project: str, version: str, revision_a: str, revision_b: str
+) -> tuple[list[models.view.CheckResult], list[models.view.CheckResult]]:
+    if checks_cache_enabled():
+        (_, _, before), (_, _, after) = await asyncio.gather(
+            checks_fetch_cached(project, version, revision_a, None),
+            checks_fetch_cached(project, version, revision_b, None),
+        )
+        return before, after
+    async with api.AsyncClient() as atr:
+        list_a, list_b = await asyncio.gather(
+            atr.checks_list(project, version, revision_a),
+            atr.checks_list(project, version, revision_b),
+        )
+    return list(list_a.checks), list(list_b.checks)
+
+
+def checks_line(check: models.view.CheckResult) -> str:
+    return f"{checks_path(check)}: {check.message} ({check.checker.removeprefix('atr.tasks.checks.')})"
+
+
+def checks_path(check: models.view.CheckResult) -> str:
+    primary_rel_path = check.primary_rel_path or "(release)"
+    if not check.member_rel_path:
+        return primary_rel_path
+    return f"{primary_rel_path} → {check.member_rel_path}"
+
+
+async def checks_wait(
+    project: str,
+    version: str,
+    revision: str | None,
+    deadline: poll.Deadline,
+    backoff: poll.Backoff,
+    stream: bool,
+) -> bool:
+    drain = poll.Drain()
+    async with api.AsyncClient() as atr:
+        if stream and (await checks_wait_stream(atr, project, version, revision, deadline, drain)):
+            return True
+        # Polling also takes over if the stream ends early or fails, or if the server does not offer one
+        # After the deadline this is a single final poll
+        while True:
+            ongoing = await atr.checks_ongoing(project, version, revision)
+            if checks_wait_progress(drain, ongoing.ongoing, deadline):
+                return True
+            if not await poll.wait(backoff, deadline):
+                return False
+
+
+def checks_wait_progress(drain: poll.Drain, ongoing: int, deadline: poll.Deadline) -> bool:
+    rate = drain.update(ongoing, deadline.elapsed())
+    show.progress(f"Checks ongoing: {ongoing}, completing {rate:.1f}/s")
+    return ongoing == 0
+
+
+async def checks_wait_stream(
+    atr: api.AsyncClient,
+    project: str,
+    version: str,
+    revision: str | None,
+    deadline: poll.Deadline,
+    drain: poll.Drain,
+) -> bool:
+    try:
+        async with asyncio.timeout(deadline.remaining()):
+            async for ongoing in atr.checks_ongoing_events(project, version, revision):
+                if checks_wait_progress(drain, ongoing.ongoing, deadline):
+                    return True
+    except aiohttp.ClientError:
+        # Includes the read timeout of a quiet stream, which subclasses TimeoutError
+        pass
+    except TimeoutError:
+        # The deadline passed, which the caller detects after its final poll
+        pass
+    return False
+
+
+def checksum_sha512_parse(text: str) -> str | None:
+    # Accepts sha512sum, BSD style, and gpg --print-md output
+    text = text.strip()
+    if match := re.fullmatch(r"SHA512 ?\(.*\) ?= ?([0-9A-Fa-f]{128})", text):
+        return match.group(1).lower()
+    candidates = [text.split()[0]] if text else []
+    if ":" in text:
+        candidates.append("".join(text.split(":", 1)[1].split()))
+    for candidate in candidates:
+        if re.fullmatch(r"[0-9A-Fa-f]{128}", candidate):
+            return candidate.lower()
+    return None
+
+
 def committee_key_check(project: str, fingerprint: str) -> None:
     committee_key = api.project_get(project).project.committee_key
     if committee_key is None:
@@ -1247,6 +1553,14 @@ def committee_key_check(project: str, fingerprint: str) -> None:
         )
 
 
+def content_hash(path: pathlib.Path) -> str:
+    hasher = blake3.blake3()
+    with path.open("rb") as fh:
+        while chunk := fh.read(1024 * 1024):
+            hasher.update(chunk)
+    return f"blake3:{hasher.hexdigest()}"
+
+
 def documentation_to_markdown(
     app: cyclopts.App,
     subcommands: list[str] | None = None,
@@ -1317,20 +1631,117 @@ def main() -> None:
     APP(sys.argv[1:])
 
 
-@contextlib.contextmanager
-def quiet() -> Generator[None]:
-    with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
-        yield
-
-
-def release_file_download(project: str, version: str, path: str, target: str) -> pathlib.Path:
+def release_file_download(
+    project: str,
+    version: str,
+    path: str,
+    target: str,
+    segments: int = 1,
+    chunk_size: int = web.DOWNLOAD_CHUNK_SIZE,
+) -> tuple[pathlib.Path, int]:
     host, verify_ssl = config.host_get()
     url = f"https://{host}/download/path/{project}/{version}/{path}"
     target_path = pathlib.Path(target)
     if target_path.is_dir():
         target_path = target_path / pathlib.Path(path).name
-    asyncio.run(web.download(url, target_path, verify_ssl=verify_ssl))
-    return target_path
+    received = web.run(web.download(url, target_path, verify_ssl, chunk_size, segments))
+    return target_path, received
+
+
+async def release_files_download(
+    project: str, version: str, rel_paths: Sequence[str], root: pathlib.Path, jobs: int, chunk_size: int
+) -> dict[str, str]:
+    host, verify_ssl = config.host_get()
+    names = set(rel_paths)
+    semaphore = asyncio.Semaphore(jobs)
+    digests: dict[str, str] = {}
+    expected: dict[str, str | None] = {}
+    results: dict[str, str] = {}
+
+    def check(rel_path: str) -> None:
+        # Called when either the file or its checksum arrives, and acts when both are present
+        if (rel_path not in digests) or (rel_path not in expected):
+            return
+        expected_digest = expected[rel_path]
+        if expected_digest is None:
+            results[rel_path] = "UNPARSEABLE"
+        else:
+            results[rel_path] = "OK" if (digests[rel_path] == expected_digest) else "FAILED"
+        print(f"{results[rel_path]} {rel_path}")
+
+    async def fetch(rel_path: str) -> None:
+        target = root / rel_path
+        target.parent.mkdir(parents=True, exist_ok=True)
+        sha512 = hashlib.sha512()
+        url = f"https://{host}/download/path/{project}/{version}/{rel_path}"
+        async with semaphore:
+            await web.download(url, target, verify_ssl, chunk_size, update=sha512.update)
+        digests[rel_path] = sha512.hexdigest()
+        artifact = rel_path.removesuffix(".sha512")
+        if (artifact != rel_path) and (artifact in names):
+            expected[artifact] = checksum_sha512_parse(target.read_text(encoding="utf-8", errors="replace"))
+            check(artifact)
+        elif f"{rel_path}.sha512" in names:
+            check(rel_path)
+
+    await asyncio.gather(*(fetch(rel_path) for rel_path in rel_paths))
+    return results
+
+
+async def release_files_existing(
+    project: str, version: str, rel_paths: Sequence[str], release_paths: Set[str], root: pathlib.Path
+) -> set[str]:
+    # Files that cannot be checked against the release are removed, so that they are downloaded again
+    host, verify_ssl = config.host_get()
+    existing: set[str] = set()
+    for rel_path in rel_paths:
+        path = root / rel_path
+        if not path.is_file():
+            continue
+        url = f"https://{host}/download/path/{project}/{version}/{rel_path}"
+        expected: str | int | None
+        if f"{rel_path}.sha512" in release_paths:
+            text = (await web.get_url(f"{url}.sha512", verify_ssl)).decode("utf-8", errors="replace")
+            expected = checksum_sha512_parse(text)
+            with path.open("rb") as fh:
+                actual: str | int = hashlib.file_digest(fh, "sha512").hexdigest()
+        else:
+            expected = await web.head_size(url, verify_ssl)
+            actual = path.stat().st_size
+        if expected is None:
+            path.unlink()
+            continue
+        if actual != expected:
+            show.error_and_exit(f"File already exists and does not match the release: {path}")
+        existing.add(rel_path)
+    return existing
+
+
+def release_files_sign(
+    secret_key: openpgp.SecretKey,
+    component: openpgp.SecretKey | openpgp.SecretSubkey,
+    password: str | None,
+    root: pathlib.Path,
+    rel_paths: Sequence[str],
+    jobs: int,
+) -> dict[str, str]:
+    # Workers get the serialised key, because openpgp keys cannot be pickled
+    key_data = secret_key.to_bytes()
+    size = math.ceil(len(rel_paths) / jobs)
+    batches = [rel_paths[start : start + size] for start in range(0, len(rel_paths), size)]
+    context = multiprocessing.get_context("spawn")
+    with concurrent.futures.ProcessPoolExecutor(max_workers=jobs, mp_context=context) as executor:
+        futures = [
+            executor.submit(
+                sign.sign_batch, key_data, component.fingerprint, password, [str(root / name) for name in batch]
+            )
+            for batch in batches
+        ]
+        try:
+            signed = [armored for future in futures for armored in future.result()]
+        except ValueError as e:
+            show.error_and_exit(f"Signing failed: {e}")
+    return dict(zip((rel_path for batch in batches for rel_path in batch), signed, strict=True))
 
 
 def releases_display(releases: Sequence[models.sql.Release]) -> None:
@@ -1361,6 +1772,126 @@ def releases_display(releases: Sequence[models.sql.Release]) -> None:
         print(f"  {version:<24} {latest:<7} {phase_short:<11} {created_formatted}")
 
 
+async def rsync_run(project: str, version: str, source: pathlib.Path, target: str) -> delta.Stats:
+    async with api.AsyncClient() as atr:
+        return await delta.sync(source, target, delta.ApiTransport(atr, project, version))
+
+
+async def sbom_generate(project: str, version: str, rel_paths: list[str], wait: bool, timeout: float) -> int:
+    async with api.AsyncClient() as atr:
+        generated = await asyncio.gather(
+            *(
+                atr.sbom_generate(
+                    models.api.SbomGenerateArgs(
+                        project=models.safe.ProjectKey(project),
+                        version=models.safe.VersionKey(version),
+                        relpath=models.safe.RelPath(rel_path),
+                    )
+                )
+                for rel_path in rel_paths
+            )
+        )
+        tasks = [result.task for result in generated]
+        if not wait:
+            for task in tasks:
+                print(task.model_dump_json(indent=None))
+            return 0
+        unfinished = 0
+        async for task in tracker.track(atr, tasks, poll.Deadline(timeout)):
+            if task.status == models.view.TaskStatus.FAILED:
+                show.warning(f"Task {task.id} failed: {task.error}")
+                unfinished += 1
+            elif not tracker.terminal(task):
+                show.warning(f"Timeout waiting for task {task.id} to complete.")
+                unfinished += 1
+            else:
+                print(task.model_dump_json(indent=None))
+        return unfinished
+
+
+def release_upload_texts(
+    project: str, version: str, texts: dict[str, str], expected_revision: str | None
+) -> models.view.Revision:
+    # Uploading several files together creates a single revision
+    files = [
+        models.api.ReleaseUploadBatchFile(
+            relpath=models.safe.RelPath(rel_path), content=base64.b64encode(text.encode("utf-8")).decode("utf-8")
+        )
+        for rel_path, text in texts.items()
+    ]
+    revision = models.safe.RevisionNumber(expected_revision) if (expected_revision is not None) else None
+    uploaded: models.api.ReleaseUploadBatchResults | models.api.ReleaseUploadResults | None = None
+    if len(files) > 1:
+        upload_batch_args = models.api.ReleaseUploadBatchArgs(
+            project=models.safe.ProjectKey(project),
+            version=models.safe.VersionKey(version),
+            files=files,
+            expected_revision=revision,
+        )
+        with contextlib.suppress(web.EndpointMissingError):
+            uploaded = release_upload_unquarantined(api.release_upload_batch(upload_batch_args))
+    if uploaded is None:
+        # Servers without the batch endpoint take one file at a time, each creating its own revision
+        for file in files:
+            upload_args = models.api.ReleaseUploadArgs(
+                project=models.safe.ProjectKey(project),
+                version=models.safe.VersionKey(version),
+                relpath=file.relpath,
+                content=file.content,
+                expected_revision=revision,
+            )
+            uploaded = release_upload_unquarantined(api.release_upload(upload_args))
+            revision = uploaded.revision.safe_number
+    if uploaded is None:
+        show.error_and_exit("No files to upload.")
+    return uploaded.revision
+
+
+def release_upload_unquarantined[T](uploaded: T | models.api.ReleaseUploadQuarantined) -> T:
+    # Signatures and checksums are never archives, so the server has no reason to quarantine them
+    if isinstance(uploaded, models.api.ReleaseUploadQuarantined):
+        show.error_and_exit("Unexpected quarantine of the uploaded files.")
+    return uploaded
+
+
+def sbom_rel_paths(project: str, version: str, paths: Sequence[str]) -> list[str]:
+    # Globs are matched against the paths in the latest revision, and other paths are used as given
+    if not any(glob.has_magic(path) for path in paths):
+        return list(dict.fromkeys(paths))
+    release_paths = api.release_paths(project, version).rel_paths
+    rel_paths = []
+    for path in paths:
+        if glob.has_magic(path):
+            rel_paths.extend(rel_path for rel_path in release_paths if fnmatch.fnmatchcase(rel_path, path))
+        else:
+            rel_paths.append(path)
+    return list(dict.fromkeys(rel_paths))
+
+
+def sidecars_upload(
+    project: str, version: str, path: str, sidecars: dict[str, str], expected_revision: str | None
+) -> None:
+    texts = {path + suffix: text for suffix, text in sidecars.items()}
+    revision = release_upload_texts(project, version, texts, expected_revision)
+    print(revision.model_dump_json(indent=None))
+
+
+def sidecars_write(file_path: pathlib.Path, sidecars: dict[str, str]) -> None:
+    written: list[pathlib.Path] = []
+    try:
+        for suffix, text in sidecars.items():
+            sidecar_path = file_path.with_name(file_path.name + suffix)
+            with sidecar_path.open("x", encoding="utf-8") as sidecar_file:
+                written.append(sidecar_path)
+                sidecar_file.write(text)
+    except BaseException as e:
+        for sidecar_path in written:
+            sidecar_path.unlink(missing_ok=True)
+        if isinstance(e, FileExistsError):
+            show.error_and_exit(f"File already exists: {e.filename}")
+        raise
+
+
 def signing_component_load(key: str | None) -> tuple[openpgp.SecretKey, openpgp.SecretKey | openpgp.SecretSubkey]:
     key_path = key
     if key_path is None:
@@ -1411,20 +1942,6 @@ def subcommands_register(app: cyclopts.App) -> None:
     app.command(APP_VOTE)
 
 
-def task_wait(task: models.sql.Task, timeout: float) -> models.sql.Task:
-    terminal = {models.sql.TaskStatus.COMPLETED, models.sql.TaskStatus.FAILED}
-    interval_seconds = 0.5
-    while task.status not in terminal:
-        if timeout <= 0:
-            show.error_and_exit("Timeout waiting for the task to complete.")
-        time.sleep(interval_seconds)
-        timeout -= interval_seconds
-        task = api.task_get(str(task.id)).task
-    if task.status == models.sql.TaskStatus.FAILED:
-        show.error_and_exit(f"Task {task.id} failed: {task.error}")
-    return task
-
-
 def timestamp_format(ts: int | str | None) -> str | None:
     if ts is None:
         return None
@@ -1436,21 +1953,126 @@ def timestamp_format(ts: int | str | None) -> str | None:
         return str(ts)
 
 
+async def upload_dir_files(
+    project: str, version: str, changed: list[tuple[str, pathlib.Path]], jobs: int
+) -> list[models.api.ReleaseUploadResults | models.api.ReleaseUploadQuarantined]:
+    semaphore = asyncio.Semaphore(jobs)
+
+    async def upload(
+        rel_path: str, path: pathlib.Path
+    ) -> models.api.ReleaseUploadResults | models.api.ReleaseUploadQuarantined:
+        async with semaphore:
+            uploaded = await upload_file(atr, project, version, rel_path, path)
+        print(f"Uploaded {rel_path}")
+        return uploaded
+
+    async with api.AsyncClient() as atr:
+        return await asyncio.gather(*(upload(rel_path, path) for rel_path, path in changed))
+
+
+async def upload_dir_hashes(project: str, version: str, rel_paths: Sequence[str], jobs: int) -> dict[str, str]:
+    # Servers without attestable data give no content hashes, so the release files are hashed as they download
+    host, verify_ssl = config.host_get()
+    semaphore = asyncio.Semaphore(jobs)
+
+    async def remote_hash(rel_path: str) -> tuple[str, str]:
+        hasher = blake3.blake3()
+        url = f"https://{host}/download/path/{project}/{version}/{rel_path}"
+        async with semaphore:
+            with open(os.devnull, "wb") as sink:
+                await web.get_url_stream(url, sink, verify_ssl, update=hasher.update)
+        return rel_path, f"blake3:{hasher.hexdigest()}"
+
+    return dict(await asyncio.gather(*(remote_hash(rel_path) for rel_path in rel_paths)))
+
+
+async def upload_dir_state(
+    project: str, version: str, local: Sequence[str], jobs: int
+) -> tuple[set[str], dict[str, str]]:
+    async with api.AsyncClient() as atr:
+        rel_paths = set((await atr.release_paths(project, version)).rel_paths)
+        try:
+            attestable = await atr.release_attestable(project, version)
+        except web.EndpointMissingError:
+            shared = [rel_path for rel_path in local if rel_path in rel_paths]
+            return rel_paths, await upload_dir_hashes(project, version, shared, jobs)
+    attested = {rel_path: entry.content_hash for rel_path, entry in attestable.attestable.paths.items()}
+    return rel_paths, attested
+
+
+async def upload_file(
+    atr: api.AsyncClient, project: str, version: str, rel_path: str, path: pathlib.Path
+) -> models.api.ReleaseUploadResults | models.api.ReleaseUploadQuarantined:
+    upload_args = models.api.ReleaseUploadStreamArgs(
+        project=models.safe.ProjectKey(project),
+        version=models.safe.VersionKey(version),
+        relpath=models.safe.RelPath(rel_path),
+    )
+    try:
+        return await atr.release_upload_stream(upload_args, path)
+    except web.EndpointMissingError:
+        # Servers without the streaming endpoint take the whole file encoded in the request
+        content = base64.b64encode(path.read_bytes()).decode("utf-8")
+        return await atr.release_upload(models.api.ReleaseUploadArgs(**upload_args.model_dump(), content=content))
+
+
+async def upload_quarantine_revision(
+    project: str, version: str, tokens: Sequence[str], revision_before: str | None, count: int, timeout: float
+) -> models.view.Revision:
+    deadline = poll.Deadline(timeout)
+    async with api.AsyncClient() as atr:
+        try:
+            held = await tracker.quarantines(atr, project, version, tokens, deadline)
+        except web.EndpointMissingError:
+            # Servers without quarantine status give no revision numbers, so the release itself is polled
+            number = await tracker.revision_follow(atr, project, version, revision_before, count, deadline)
+            if number is None:
+                show.error_and_exit("Timeout waiting for archive validation to complete.")
+            return await upload_revision_get(atr, project, version, number)
+        failed = [entry.quarantined for entry in held if tracker.quarantine_failed(entry)]
+        if failed:
+            show.error_and_exit(upload_quarantine_failure(failed))
+        numbers = [entry.revision for entry in held if entry.revision is not None]
+        if len(numbers) < len(held):
+            show.error_and_exit("Timeout waiting for archive validation to complete.")
+        # Revision numbers are zero padded, so the greatest is the latest
+        return await upload_revision_get(atr, project, version, max(numbers))
+
+
+def upload_quarantine_failure(failed: Sequence[models.view.Quarantined]) -> str:
+    lines = ["Archive validation failed:"]
+    for quarantined in failed:
+        errors = [(entry.rel_path, error) for entry in quarantined.file_metadata or [] for error in entry.errors]
+        lines.extend(f"  - {rel_path}: {error}" for rel_path, error in errors)
+        if not errors:
+            lines.append(f"  - {quarantined.token}: {quarantined.status.value}")
+    return "\n".join(lines)
+
+
 def upload_quarantine_wait(
-    project: str, version: str, revision_before: str | None, timeout: float = 60
-) -> models.sql.Revision:
-    print("Upload quarantined pending archive validation.")
-    interval_seconds = 0.5
-    while timeout > 0:
-        revision_number = api.release_get(project, version).release.latest_revision_number
-        if isinstance(revision_number, str) and (revision_number != revision_before):
-            revisions = api.release_revisions(project, version).revisions
-            for revision in revisions:
-                if revision.number == revision_number:
-                    return revision
-        time.sleep(interval_seconds)
-        timeout -= interval_seconds
-    show.error_and_exit("Timeout waiting for archive validation to complete.")
+    project: str,
+    version: str,
+    tokens: Sequence[str],
+    revision_before: str | None,
+    count: int,
+    timeout: float = 60,
+) -> models.view.Revision:
+    if len(tokens) == 1:
+        print("Upload quarantined pending archive validation.")
+    else:
+        print(f"{len(tokens)} uploads quarantined pending archive validation.")
+    return web.run(upload_quarantine_revision(project, version, tokens, revision_before, count, timeout))
+
+
+async def upload_revision_get(atr: api.AsyncClient, project: str, version: str, number: str) -> models.view.Revision:
+    try:
+        return (await atr.release_revision(project, version, number)).revision
+    except web.EndpointMissingError:
+        revisions = (await atr.release_revisions(project, version)).revisions
+    for revision in revisions:
+        if revision.number == number:
+            return revision
+    show.error_and_exit(f"Revision {number} not found.")
 
 
 def value_read(stdin: bool) -> str:
@@ -1468,24 +2090,48 @@ def value_read(stdin: bool) -> str:
     return value
 
 
+def verify_outcomes_display(outcomes: Sequence[verify.Outcome], as_json: bool) -> None:
+    invalid = [outcome for outcome in outcomes if not outcome.valid]
+    if as_json:
+        print(json.dumps([dataclasses.asdict(outcome) for outcome in outcomes], indent=2))
+    else:
+        print(f"  {'Status':<8} {'Key':<40} {'Artifact'}")
+        for outcome in outcomes:
+            status = "VALID" if outcome.valid else "INVALID"
+            print(f"  {status:<8} {(outcome.fingerprint or '-').upper():<40} {outcome.artifact}")
+            if outcome.issue:
+                print(f"           {outcome.issue}")
+        print(f"Verified {len(outcomes)} signatures: {len(outcomes) - len(invalid)} valid, {len(invalid)} invalid")
+    if invalid:
+        show.error_and_exit(f"{len(invalid)} signatures are not valid!")
+
+
 def verify_summary(
     verify_provenance: models.api.SignatureProvenanceResults,
     signature_data: bytes,
-    artifact_data: bytes,
+    artifact_path: pathlib.Path,
     verbose: bool = False,
 ) -> None:
-    key, _ = ForceUnexpiredOpenPGPKey.from_blob(verify_provenance.key_asc_text)
-    sig = pgpy.PGPSignature.from_blob(signature_data)
-    with quiet():
-        verification_result = key.verify(artifact_data, sig)
-    bad_signatures = sum(1 for _ in verification_result.bad_signatures)
-    good_signatures = sum(1 for _ in verification_result.good_signatures)
-    if bad_signatures:
-        if good_signatures:
+    try:
+        key, _ = openpgp.PublicKey.from_armor(verify_provenance.key_asc_text)
+        signatures = verify.signatures_parse(signature_data)
+    except ValueError as e:
+        show.error_and_exit(f"Could not parse the key or signature: {e}")
+    if not signatures:
+        show.error_and_exit("The signature file contains no signatures.")
+
+    # The openpgp verifier streams the file, and does not check key expiry
+    issues = []
+    for signature in signatures:
+        try:
+            signature.verify_file(key, artifact_path)
+        except ValueError as e:
+            issues.append(str(e))
+    if issues:
+        if len(issues) < len(signatures):
             show.error_and_exit("There was an uncertain mixture of good and bad signatures.")
-        for bad_signature in verification_result.bad_signatures:
-            for issue in bad_signature.issues:
-                print(f"The verification package reported the following issue: {issue.name}")
+        for issue in issues:
+            print(f"The verification package reported the following issue: {issue}")
         show.error_and_exit("The signature is not valid!")
     if verbose:
         print("The signature is valid! This completes the verification process.")
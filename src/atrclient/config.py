@@ -20,68 +20,113 @@ from __future__ import annotations
 import asyncio
 import contextlib
 import copy
+import functools
 import os
 import pathlib
 import time
-from typing import TYPE_CHECKING, Any, Literal
+from typing import TYPE_CHECKING, Any, Final, Literal
 
-if TYPE_CHECKING:
-    from collections.abc import Generator
-
-import filelock
-import jwt
 import platformdirs
-import pydantic
-import strictyaml
 
+import atrclient.lazy as lazy
 import atrclient.models as models
 import atrclient.show as show
 import atrclient.web as web
 
+if TYPE_CHECKING:
+    from collections.abc import Generator
+
+    import filelock
+    import jwt
+    import pydantic
+    import strictyaml
+else:
+    filelock = lazy.module("filelock")
+    jwt = lazy.module("jwt")
+    pydantic = lazy.module("pydantic")
+    strictyaml = lazy.module("strictyaml")
+
+JWT_REFRESH_MARGIN: Final[int] = 5 * 60
 YAML_DEFAULTS: dict[str, Any] = {"asf": {}, "atr": {}, "output": {}, "tokens": {}}
-YAML_SCHEMA: strictyaml.Map = strictyaml.Map(
-    {
-        strictyaml.Optional("atr"): strictyaml.Map(
-            {
-                strictyaml.Optional("host"): strictyaml.Str(),
-            }
-        ),
-        strictyaml.Optional("asf"): strictyaml.Map(
-            {
-                strictyaml.Optional("uid"): strictyaml.Str(),
-            }
-        ),
-        strictyaml.Optional("output"): strictyaml.Map(
-            {
-                strictyaml.Optional("json"): strictyaml.Bool(),
-            }
-        ),
-        strictyaml.Optional("signing"): strictyaml.Map(
-            {
-                strictyaml.Optional("key"): strictyaml.Str(),
-            }
-        ),
-        strictyaml.Optional("tokens"): strictyaml.Map(
-            {
-                strictyaml.Optional("pat"): strictyaml.Str(),
-                strictyaml.Optional("jwt"): strictyaml.Str(),
-            }
-        ),
-    }
-)
+
+
+class Snapshot:
+    def __init__(self) -> None:
+        self.path: pathlib.Path | None = None
+        self.stat: tuple[int, int] | None = None
+        self.data: dict[str, Any] | None = None
+
+    def get(self) -> dict[str, Any]:
+        # The stat comes first, so a change during the read is caught by the next call
+        config_path = path()
+        config_stat = file_stat(config_path)
+        if (self.data is None) or (config_path != self.path) or (config_stat != self.stat):
+            self.path = config_path
+            self.stat = config_stat
+            self.data = read()
+        return copy.deepcopy(self.data)
+
+    def invalidate(self) -> None:
+        self.data = None
+
+
+SNAPSHOT: Final[Snapshot] = Snapshot()
+
+
+class Tokens:
+    def __init__(self) -> None:
+        self.jwt_value: str | None = None
+        self.payload: dict[str, Any] = {}
+        self.refreshing: dict[str | None, asyncio.Task[str]] = {}
+
+    def decode(self, jwt_value: str) -> dict[str, Any]:
+        # The payload is decoded again only when the stored token changes
+        if jwt_value == self.jwt_value:
+            return self.payload
+        if jwt_value == "dummy_jwt_token":
+            # TODO: Use a better test JWT
+            payload = {"exp": time.time() + 90 * 60, "sub": "test_asf_uid"}
+        else:
+            try:
+                payload = jwt.decode(jwt_value, options={"verify_signature": False})
+            except jwt.PyJWTError as e:
+                show.error_and_exit(f"Failed to decode JWT: {e}")
+            if not isinstance(payload, dict):
+                show.error_and_exit("Invalid JWT payload.")
+        self.jwt_value = jwt_value
+        self.payload = payload
+        return payload
+
+    async def refresh(self, asf_uid: str | None) -> str:
+        # Concurrent callers for the same ASF UID share a single /jwt/create request
+        task = self.refreshing.get(asf_uid)
+        if (task is None) or task.done() or (task.get_loop() is not asyncio.get_running_loop()):
+            task = asyncio.get_running_loop().create_task(jwt_refresh_async(asf_uid))
+            self.refreshing[asf_uid] = task
+        return await asyncio.shield(task)
+
+
+TOKENS: Final[Tokens] = Tokens()
 
 
 def drop(config: dict[str, Any], parts: list[str]) -> None:
     walk(config, parts, "drop")
 
 
+def file_stat(config_path: pathlib.Path) -> tuple[int, int] | None:
+    try:
+        stat = config_path.stat()
+    except FileNotFoundError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
 def get(config: dict[str, Any], parts: list[str]) -> Any | None:
     return walk(config, parts, "get")[1]
 
 
 def host_get() -> tuple[str, bool]:
-    with lock() as config:
-        host = config.get("atr", {}).get("host", "release-test.apache.org")
+    host = snapshot().get("atr", {}).get("host", "release-test.apache.org")
     local_domains = ["localhost.apache.org", "127.0.0.1"]
     domain = host.split(":")[0]
     verify_ssl = domain not in local_domains
@@ -89,33 +134,25 @@ def host_get() -> tuple[str, bool]:
 
 
 def jwt_get() -> str | None:
-    with lock() as config:
-        jwt_value = get(config, ["tokens", "jwt"])
-    return jwt_value
+    return get(snapshot(), ["tokens", "jwt"])
 
 
 def jwt_payload() -> tuple[str | None, dict[str, Any]]:
     jwt_value = jwt_get()
     if jwt_value is None:
         return None, {}
-    if jwt_value == "dummy_jwt_token":
-        # TODO: Use a better test JWT
-        return jwt_value, {"exp": time.time() + 90 * 60, "sub": "test_asf_uid"}
-
-    try:
-        payload = jwt.decode(jwt_value, options={"verify_signature": False})
-    except jwt.PyJWTError as e:
-        show.error_and_exit(f"Failed to decode JWT: {e}")
-    if not isinstance(payload, dict):
-        show.error_and_exit("Invalid JWT payload.")
-    return jwt_value, payload
+    return jwt_value, TOKENS.decode(jwt_value)
 
 
 def jwt_refresh(asf_uid: str | None = None) -> str:
-    with lock() as config:
-        pat_value = get(config, ["tokens", "pat"])
-        if asf_uid is None:
-            asf_uid = config.get("asf", {}).get("uid")
+    return web.run(jwt_refresh_async(asf_uid))
+
+
+async def jwt_refresh_async(asf_uid: str | None = None) -> str:
+    config = snapshot()
+    pat_value = get(config, ["tokens", "pat"])
+    if asf_uid is None:
+        asf_uid = config.get("asf", {}).get("uid")
 
     if pat_value is None:
         show.error_and_exit("No Personal Access Token stored.")
@@ -125,11 +162,11 @@ def jwt_refresh(asf_uid: str | None = None) -> str:
     host, verify_ssl = host_get()
     url = f"https://{host}/api/jwt/create"
     args = models.api.JwtCreateArgs(asfuid=asf_uid, pat=pat_value)
-    response = asyncio.run(web.post(url, args, jwt_token=None, verify_ssl=verify_ssl))
+    response = await web.post(url, args, jwt_token=None, verify_ssl=verify_ssl)
     try:
-        jwt_results = models.api.validate_jwt_create(response)
-    except (pydantic.ValidationError, models.api.ResultsTypeError) as e:
-        show.error_and_exit(f"Unexpected API response: {response}\n{e}")
+        jwt_results = models.api.validate_jwt_create.json(response)
+    except pydantic.ValidationError as e:
+        show.error_and_exit(f"Unexpected API response: {response.decode('utf-8', errors='replace')}\n{e}")
 
     with lock(write_to_disk=True) as config:
         set_value(config, ["tokens", "jwt"], jwt_results.jwt)
@@ -138,17 +175,22 @@ def jwt_refresh(asf_uid: str | None = None) -> str:
 
 
 def jwt_usable() -> str:
-    with lock() as config:
-        config_asf_uid = get(config, ["asf", "uid"])
+    return web.run(jwt_usable_async())
+
 
+async def jwt_usable_async() -> str:
+    config = snapshot()
+    config_asf_uid = get(config, ["asf", "uid"])
     jwt_value, payload = jwt_payload()
     if jwt_value is None:
         if config_asf_uid is None:
             show.error_and_exit("No ASF UID stored in configuration.")
-        return jwt_refresh(config_asf_uid)
+        return await TOKENS.refresh(config_asf_uid)
 
+    # Refreshing ahead of expiry stops a long loop from failing on the request that straddles it
+    margin = get(config, ["tokens", "refresh_margin"])
     exp = payload.get("exp") or 0
-    if exp < time.time():
+    if exp < (time.time() + (JWT_REFRESH_MARGIN if (margin is None) else margin)):
         payload_asf_uid = payload.get("sub")
         if not payload_asf_uid:
             show.error_and_exit("No ASF UID in JWT payload.")
@@ -157,18 +199,21 @@ def jwt_usable() -> str:
             # But we will refresh the JWT anyway
             # It will still fail if the PAT is not valid
             show.warning(f"JWT ASF UID {payload_asf_uid} does not match configuration ASF UID {config_asf_uid}")
-        return jwt_refresh(payload_asf_uid)
+        return await TOKENS.refresh(payload_asf_uid)
     return jwt_value
 
 
 @contextlib.contextmanager
 def lock(write_to_disk: bool = False) -> Generator[dict[str, Any]]:
+    if write_to_disk is False:
+        # Readers use the snapshot, and only writers need the file lock
+        yield snapshot()
+        return
     lock = filelock.FileLock(str(path()) + ".lock")
     with lock:
         cfg = read()
         yield cfg
-        if write_to_disk is True:
-            write(cfg)
+        write(cfg)
 
 
 def path() -> pathlib.Path:
@@ -181,7 +226,7 @@ def read() -> dict[str, Any]:
     config_file = path()
     if config_file.exists():
         try:
-            data = strictyaml.load(config_file.read_text(), YAML_SCHEMA).data
+            data = strictyaml.load(config_file.read_text(), yaml_schema()).data
             if not isinstance(data, dict):
                 raise RuntimeError("Invalid atr.yaml: not a dictionary")
             return data
@@ -194,6 +239,10 @@ def set_value(config: dict[str, Any], parts: list[str], val: Any) -> None:
     walk(config, parts, "set", val)
 
 
+def snapshot() -> dict[str, Any]:
+    return SNAPSHOT.get()
+
+
 def walk(
     config: dict[str, Any],
     parts: list[str],
@@ -230,6 +279,7 @@ def walk(
 
 
 def write(data: dict[str, Any]) -> None:
+    SNAPSHOT.invalidate()
     data = {k: v for k, v in data.items() if not (isinstance(v, dict) and not v)}
     config_path = path()
     if not data:
@@ -241,7 +291,48 @@ def write(data: dict[str, Any]) -> None:
     tmp.unlink(missing_ok=True)
     tmp.touch(mode=0o600)
     tmp.write_text(
-        strictyaml.as_document(data, YAML_SCHEMA).as_yaml(),
+        strictyaml.as_document(data, yaml_schema()).as_yaml(),
         encoding="utf-8",
     )
     os.replace(tmp, config_path)
+
+
+@functools.cache
+def yaml_schema() -> strictyaml.Map:
+    # Built on first use, so that commands which never read the configuration do not import strictyaml
+    return strictyaml.Map(
+        {
+            strictyaml.Optional("atr"): strictyaml.Map(
+                {
+                    strictyaml.Optional("host"): strictyaml.Str(),
+                }
+            ),
+            strictyaml.Optional("asf"): strictyaml.Map(
+                {
+                    strictyaml.Optional("uid"): strictyaml.Str(),
+                }
+            ),
+            strictyaml.Optional("cache"): strictyaml.Map(
+                {
+                    strictyaml.Optional("checks"): strictyaml.Bool(),
+                }
+            ),
+            strictyaml.Optional("output"): strictyaml.Map(
+                {
+                    strictyaml.Optional("json"): strictyaml.Bool(),
+                }
+            ),
+            strictyaml.Optional("signing"): strictyaml.Map(
+                {
+                    strictyaml.Optional("key"): strictyaml.Str(),
+                }
+            ),
+            strictyaml.Optional("tokens"): strictyaml.Map(
+                {
+                    strictyaml.Optional("pat"): strictyaml.Str(),
+                    strictyaml.Optional("jwt"): strictyaml.Str(),
+                    strictyaml.Optional("refresh_margin"): strictyaml.Int(),
+                }
+            ),
+        }
+    )
@@ -0,0 +1,344 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+from __future__ import annotations
+
+import dataclasses
+import hashlib
+import itertools
+import math
+import mmap
+import struct
+from typing import TYPE_CHECKING, Final, Protocol
+
+import atrclient.api as api
+import atrclient.lazy as lazy
+import atrclient.models as models
+
+if TYPE_CHECKING:
+    import pathlib
+    from collections.abc import AsyncIterator, Iterable, Iterator
+    from typing import BinaryIO
+
+    import numpy
+else:
+    numpy = lazy.module("numpy")
+
+BLOCK_SIZE_MAX: Final[int] = 128 * 1024
+BLOCK_SIZE_MIN: Final[int] = 2 * 1024
+DATA_SIZE_MAX: Final[int] = 1024 * 1024
+ENCODING_COPY: Final[bytes] = b"C"
+ENCODING_DATA: Final[bytes] = b"D"
+ENCODING_HEADER: Final[struct.Struct] = struct.Struct(">cQQ")
+SEARCH_FILTER_BITS: Final[int] = 22
+SEARCH_SEGMENT_SIZE: Final[int] = 1024 * 1024
+WEAK_MODULUS: Final[int] = 1 << 16
+
+
+class ApiTransport:
+    def __init__(self, atr: api.AsyncClient, project: str, version: str) -> None:
+        self.atr = atr
+        self.project = project
+        self.version = version
+        self.revision: str | None = None
+
+    async def patch(self, rel_path: str, base: models.api.DeltaSignature, chunks: AsyncIterator[bytes]) -> None:
+        if self.revision is None:
+            raise RuntimeError("Signatures must be fetched before patching")
+        patch_args = models.api.ReleasePatchArgs(
+            project=models.safe.ProjectKey(self.project),
+            version=models.safe.VersionKey(self.version),
+            relpath=models.safe.RelPath(rel_path),
+            revision=models.safe.RevisionNumber(self.revision),
+        )
+        await self.atr.release_patch(patch_args, chunks)
+        print(f"Patched {rel_path}")
+
+    async def signatures(self) -> dict[str, models.api.DeltaSignature]:
+        signatures = await self.atr.release_signatures(self.project, self.version)
+        self.revision = signatures.revision
+        return signatures.signatures
+
+    async def upload(self, rel_path: str, path: pathlib.Path) -> None:
+        upload_args = models.api.ReleaseUploadStreamArgs(
+            project=models.safe.ProjectKey(self.project),
+            version=models.safe.VersionKey(self.version),
+            relpath=models.safe.RelPath(rel_path),
+        )
+        await self.atr.release_upload_stream(upload_args, path)
+        print(f"Uploaded {rel_path}")
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class BlockCopy:
+    index: int
+    count: int
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class BlockData:
+    data: bytes
+
+
+@dataclasses.dataclass
+class Stats:
+    files: int = 0
+    files_skipped: int = 0
+    bytes_copied: int = 0
+    bytes_sent: int = 0
+
+    @property
+    def bytes_total(self) -> int:
+        return self.bytes_copied + self.bytes_sent
+
+
+class Transport(Protocol):
+    async def patch(self, rel_path: str, base: models.api.DeltaSignature, chunks: AsyncIterator[bytes]) -> None: ...
+
+    async def signatures(self) -> dict[str, models.api.DeltaSignature]: ...
+
+    async def upload(self, rel_path: str, path: pathlib.Path) -> None: ...
+
+
+type Op = BlockCopy | BlockData
+
+
+def block_match(
+    data: bytes | mmap.mmap,
+    position: int,
+    window: int,
+    weak: int,
+    base: models.api.DeltaSignature,
+    table: dict[int, dict[str, int]],
+) -> int | None:
+    last_index = len(base.weak) - 1
+    if window not in (base.block_size, base.size - (last_index * base.block_size)):
+        return None
+    candidates = table.get(weak)
+    if not candidates:
+        return None
+    index = candidates.get(strong_checksum(data[position : position + window]))
+    if (window != base.block_size) and (index != last_index):
+        # Only the final block of the base may be shorter than the block size
+        return None
+    return index
+
+
+def block_size_choose(size: int) -> int:
+    # Follows rsync in using roughly the square root of the file size
+    block_size = (math.isqrt(size) // 8) * 8
+    return max(BLOCK_SIZE_MIN, min(BLOCK_SIZE_MAX, block_size))
+
+
+async def chunks_async(chunks: Iterable[bytes]) -> AsyncIterator[bytes]:
+    for chunk in chunks:
+        yield chunk
+
+
+def data_blocks(data: bytes | mmap.mmap, start: int, end: int) -> Iterator[BlockData]:
+    for offset in range(start, end, DATA_SIZE_MAX):
+        yield BlockData(bytes(data[offset : min(offset + DATA_SIZE_MAX, end)]))
+
+
+def decode(stream: BinaryIO) -> Iterator[Op]:
+    while header := stream.read(ENCODING_HEADER.size):
+        if len(header) != ENCODING_HEADER.size:
+            raise ValueError("Truncated delta header")
+        kind, first, second = ENCODING_HEADER.unpack(header)
+        match kind:
+            case b"C":
+                yield BlockCopy(first, second)
+            case b"D":
+                data = stream.read(first)
+                if len(data) != first:
+                    raise ValueError("Truncated delta data")
+                yield BlockData(data)
+            case _:
+                raise ValueError(f"Unknown delta operation: {kind!r}")
+
+
+def encode(ops: Iterable[Op]) -> Iterator[bytes]:
+    for op in ops:
+        match op:
+            case BlockCopy(index=index, count=count):
+                yield ENCODING_HEADER.pack(ENCODING_COPY, index, count)
+            case BlockData(data=data):
+                yield ENCODING_HEADER.pack(ENCODING_DATA, len(data), 0)
+                yield data
+
+
+def ops(data: bytes | mmap.mmap, base: models.api.DeltaSignature) -> Iterator[Op]:
+    return ops_merge(ops_unmerged(data, base))
+
+
+def ops_file(path: pathlib.Path, base: models.api.DeltaSignature) -> Iterator[Op]:
+    with path.open("rb") as fh:
+        if path.stat().st_size == 0:
+            return
+        with mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            yield from ops(data, base)
+
+
+def ops_merge(unmerged: Iterable[Op]) -> Iterator[Op]:
+    pending: BlockCopy | None = None
+    for op in unmerged:
+        if isinstance(op, BlockCopy) and (pending is not None) and (pending.index + pending.count == op.index):
+            pending = BlockCopy(pending.index, pending.count + op.count)
+            continue
+        if pending is not None:
+            yield pending
+            pending = None
+        if isinstance(op, BlockCopy):
+            pending = op
+        else:
+            yield op
+    if pending is not None:
+        yield pending
+
+
+def ops_unmerged(data: bytes | mmap.mmap, base: models.api.DeltaSignature) -> Iterator[Op]:
+    # Matches are taken greedily from the start, as if a rolling checksum were slid one byte at a time
+    table = signature_table(base)
+    size = len(data)
+    position = 0
+    for candidate, weak in weak_candidates(data, base.block_size, table):
+        if candidate < position:
+            continue
+        index = block_match(data, candidate, base.block_size, weak, base, table)
+        if index is None:
+            continue
+        yield from data_blocks(data, position, candidate)
+        yield BlockCopy(index, 1)
+        position = candidate + base.block_size
+
+    # A window that reaches the end of the data can only match the shorter final block of the base
+    last_size = base.size - ((len(base.weak) - 1) * base.block_size)
+    tail = size - last_size
+    if (last_size < base.block_size) and (tail >= position):
+        a, b = weak_checksum(data[tail:size])
+        index = block_match(data, tail, last_size, a | (b << 16), base, table)
+        if index is not None:
+            yield from data_blocks(data, position, tail)
+            yield BlockCopy(index, 1)
+            position = size
+    yield from data_blocks(data, position, size)
+
+
+def patch(base: bytes | mmap.mmap, block_size: int, delta: Iterable[Op], target: BinaryIO) -> None:
+    for op in delta:
+        match op:
+            case BlockCopy(index=index, count=count):
+                start = index * block_size
+                target.write(base[start : start + (count * block_size)])
+            case BlockData(data=data):
+                target.write(data)
+
+
+def signature(data: bytes | mmap.mmap, block_size: int | None = None) -> models.api.DeltaSignature:
+    size = len(data)
+    if block_size is None:
+        block_size = block_size_choose(size)
+    weak = []
+    strong = []
+    for start in range(0, size, block_size):
+        block = data[start : start + block_size]
+        a, b = weak_checksum(block)
+        weak.append(a | (b << 16))
+        strong.append(strong_checksum(block))
+    return models.api.DeltaSignature(block_size=block_size, size=size, weak=weak, strong=strong)
+
+
+def signature_table(base: models.api.DeltaSignature) -> dict[int, dict[str, int]]:
+    table: dict[int, dict[str, int]] = {}
+    for index, (weak, strong) in enumerate(zip(base.weak, base.strong, strict=True)):
+        table.setdefault(weak, {}).setdefault(strong, index)
+    return table
+
+
+def stats_count(delta: Iterable[Op], stats: Stats) -> Iterator[Op]:
+    for op in delta:
+        if isinstance(op, BlockData):
+            stats.bytes_sent += len(op.data)
+        yield op
+
+
+def strong_checksum(block: bytes) -> str:
+    return hashlib.blake2b(block, digest_size=16).hexdigest()
+
+
+async def sync(root: pathlib.Path, prefix: str, transport: Transport) -> Stats:
+    stats = Stats()
+    remote = await transport.signatures()
+    for path in sorted(path for path in root.rglob("*") if path.is_file()):
+        rel_path = prefix + path.relative_to(root).as_posix()
+        stats.files += 1
+        base = remote.get(rel_path)
+        if base is None:
+            await transport.upload(rel_path, path)
+            stats.bytes_sent += path.stat().st_size
+            continue
+
+        size = path.stat().st_size
+        delta = ops_file(path, base)
+        first = next(delta, None)
+        if (size == base.size) and (first in (None, BlockCopy(0, len(base.weak)))):
+            stats.files_skipped += 1
+            stats.bytes_copied += size
+            continue
+        sent_before = stats.bytes_sent
+        delta = itertools.chain([] if (first is None) else [first], delta)
+        await transport.patch(rel_path, base, chunks_async(encode(stats_count(delta, stats))))
+        stats.bytes_copied += size - (stats.bytes_sent - sent_before)
+    return stats
+
+
+def weak_candidates(
+    data: bytes | mmap.mmap, window: int, table: dict[int, dict[str, int]]
+) -> Iterator[tuple[int, int]]:
+    # Yields in order each position whose full window has a weak checksum in the table, with that checksum
+    # The checksums of every window in a segment are computed at once from prefix sums, not rolled byte by byte
+    # The sums wrap modulo 2**64, which leaves them exact modulo WEAK_MODULUS
+    positions = len(data) - window + 1
+    if (positions <= 0) or (not table):
+        return
+    # A lookup array indexed by the low bits of each checksum discards almost every window before the table is used
+    mask = numpy.uint64((1 << SEARCH_FILTER_BITS) - 1)
+    present = numpy.zeros(1 << SEARCH_FILTER_BITS, dtype=numpy.bool_)
+    present[numpy.fromiter(table, dtype=numpy.uint64, count=len(table)) & mask] = True
+    view = numpy.frombuffer(data, dtype=numpy.uint8)
+    for start in range(0, positions, SEARCH_SEGMENT_SIZE):
+        end = min(start + SEARCH_SEGMENT_SIZE, positions)
+        length = end - start + window - 1
+        sums = numpy.zeros(length + 1, dtype=numpy.uint64)
+        numpy.cumsum(view[start : start + length], dtype=numpy.uint64, out=sums[1:])
+        sums_of_sums = numpy.zeros(length + 1, dtype=numpy.uint64)
+        numpy.cumsum(sums[1:], dtype=numpy.uint64, out=sums_of_sums[1:])
+        count = end - start
+        # Computed in place, as each temporary array is as large as the segment
+        weak = sums_of_sums[window : window + count] - sums_of_sums[:count]
+        weak -= sums[:count] * numpy.uint64(window)
+        weak &= numpy.uint64(WEAK_MODULUS - 1)
+        weak <<= numpy.uint64(16)
+        weak |= (sums[window : window + count] - sums[:count]) & numpy.uint64(WEAK_MODULUS - 1)
+        for offset in numpy.flatnonzero(present[weak & mask]):
+            checksum = int(weak[offset])
+            if checksum in table:
+                yield start + int(offset), checksum
+
+
+def weak_checksum(block: bytes) -> tuple[int, int]:
+    return sum(block) % WEAK_MODULUS, sum(itertools.accumulate(block)) % WEAK_MODULUS
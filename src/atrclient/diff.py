@@ -0,0 +1,78 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+from __future__ import annotations
+
+import dataclasses
+from typing import TYPE_CHECKING
+
+import atrclient.models as models
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+type Key = tuple[str, str | None, str | None, str]
+
+
+@dataclasses.dataclass
+class Changes:
+    added: list[models.view.CheckResult] = dataclasses.field(default_factory=list)
+    removed: list[models.view.CheckResult] = dataclasses.field(default_factory=list)
+    # Pairs of the result before and after, filed under the status after
+    changed: list[tuple[models.view.CheckResult, models.view.CheckResult]] = dataclasses.field(default_factory=list)
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.removed or self.changed)
+
+
+def checks(
+    before: Iterable[models.view.CheckResult], after: Iterable[models.view.CheckResult]
+) -> dict[models.view.CheckResultStatus, Changes]:
+    # Every result is indexed and looked up once per pass, so the comparison is linear in the number of results
+    changes = {status: Changes() for status in models.view.CheckResultStatus}
+    exact: dict[tuple[Key, models.view.CheckResultStatus], list[models.view.CheckResult]] = {}
+    for check in before:
+        exact.setdefault((key(check), check.status), []).append(check)
+
+    # Results with the same key and status in both revisions are unchanged
+    unmatched: list[models.view.CheckResult] = []
+    for check in after:
+        candidates = exact.get((key(check), check.status))
+        if candidates:
+            candidates.pop()
+        else:
+            unmatched.append(check)
+
+    # Of the rest, results with the same key in both revisions have changed status
+    remaining: dict[Key, list[models.view.CheckResult]] = {}
+    for (check_key, _status), candidates in exact.items():
+        remaining.setdefault(check_key, []).extend(candidates)
+    for check in unmatched:
+        candidates = remaining.get(key(check))
+        if candidates:
+            changes[check.status].changed.append((candidates.pop(), check))
+        else:
+            changes[check.status].added.append(check)
+
+    for candidates in remaining.values():
+        for check in candidates:
+            changes[check.status].removed.append(check)
+    return changes
+
+
+def key(check: models.view.CheckResult) -> Key:
+    return (check.checker, check.primary_rel_path, check.member_rel_path, check.message)
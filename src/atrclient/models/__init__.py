@@ -15,22 +15,27 @@
 # specific language governing permissions and limitations
 # under the License.
 
-from . import (
-    api,
-    args,
-    basic,
-    cap,
-    distribution,
-    github,
-    helpers,
-    mail,
-    results,
-    safe,
-    schema,
-    sql,
-    tabulate,
-    validation,
-)
+import importlib
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from . import (
+        api,
+        args,
+        basic,
+        cap,
+        distribution,
+        github,
+        helpers,
+        mail,
+        results,
+        safe,
+        schema,
+        sql,
+        tabulate,
+        validation,
+        view,
+    )
 
 # If we use .__name__, pyright gives a warning
 __all__ = [
@@ -48,4 +53,12 @@ __all__ = [
     "sql",
     "tabulate",
     "validation",
+    "view",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    # Submodules are imported on first use, because sql and validation are slow to import
+    if name in __all__:
+        return importlib.import_module(f"{__name__}.{name}")
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
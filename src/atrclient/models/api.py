@@ -17,23 +17,20 @@
 
 import dataclasses
 import datetime
+import functools
 import re
-from collections.abc import Callable, Sequence
+from collections.abc import Sequence
 from typing import Annotated, Any, Literal, Self, TypeVar
 
 import pydantic
 
-from . import safe, schema, sql, tabulate, validation
+from . import attestable, safe, schema, sql, tabulate, validation, view
 
 T = TypeVar("T")
 
 type TrustedWorkflowPhase = Literal["compose", "vote", "finish"]
 
 
-class ResultsTypeError(TypeError):
-    pass
-
-
 class CatalogArtifact(schema.Strict):
     artifact_path: str
     classification: str | None
@@ -96,14 +93,14 @@ class CatalogProjectResults(schema.Strict):
 
 class ChecksListResults(schema.Strict):
     endpoint: Literal["/checks/list"] = schema.alias("endpoint")
-    checks: Sequence[sql.CheckResult]
+    checks: Sequence[view.CheckResult]
     checks_revision: safe.RevisionNumber = schema.example("00005")
-    current_phase: sql.ReleasePhase = schema.example(sql.ReleasePhase.RELEASE_CANDIDATE)
+    current_phase: view.ReleasePhase = schema.example(view.ReleasePhase.RELEASE_CANDIDATE)
 
     @pydantic.field_validator("current_phase", mode="before")
     @classmethod
     def current_phase_to_enum(cls, v):
-        return sql.ReleasePhase(v) if isinstance(v, str) else v
+        return view.ReleasePhase(v) if isinstance(v, str) else v
 
 
 class ChecksOngoingResults(schema.Strict):
@@ -131,6 +128,13 @@ class CommitteesListResults(schema.Strict):
     committees: Sequence[sql.Committee]
 
 
+class DeltaSignature(schema.Strict):
+    block_size: int = schema.example(2048)
+    size: int = schema.example(4096)
+    weak: list[int] = schema.example([1627914911, 2076837981])
+    strong: list[str] = schema.example(["9b1c4a8e7d3f2b6c5a4e3d2c1b0a9f8e", "0f1e2d3c4b5a69788796a5b4c3d2e1f0"])
+
+
 class DistributeSshRegisterArgs(schema.Strict):
     publisher: str = schema.example("user")
     jwt: str = schema.example("eyJhbGciOiJIUzI1[...]mMjLiuyu5CSpyHI=")
@@ -687,6 +691,13 @@ class PublisherVoteResolveResults(schema.Strict):
     success: Literal[True] = schema.example(True)
 
 
+class QuarantineGetResults(schema.Strict):
+    endpoint: Literal["/quarantine/get"] = schema.alias("endpoint")
+    quarantined: view.Quarantined
+    # The number of the revision created from the quarantined files, once they have passed validation
+    revision: str | None = schema.default_example(None, "00006")
+
+
 class ReleaseAnnounceArgs(schema.Strict):
     project: safe.ProjectKey = schema.example("example")
     version: safe.VersionKey = schema.example("1.0.0")
@@ -713,6 +724,12 @@ class ReleaseDraftDeleteResults(schema.Strict):
     success: Literal[True] = schema.example(True)
 
 
+class ReleaseAttestableResults(schema.Strict):
+    endpoint: Literal["/release/attestable"] = schema.alias("endpoint")
+    revision: str = schema.example("00003")
+    attestable: attestable.AttestableV2
+
+
 class ReleaseCreateArgs(schema.Strict):
     project: safe.ProjectKey = schema.example("example")
     version: safe.VersionKey = schema.example("0.0.1")
@@ -751,14 +768,37 @@ class ReleaseGetResults(schema.Strict):
         return v
 
 
+class ReleasePatchArgs(schema.Strict):
+    project: safe.ProjectKey = schema.example("example")
+    version: safe.VersionKey = schema.example("0.0.1")
+    relpath: safe.RelPath = schema.example("example/0.0.1/example-0.0.1-bin.tar.gz")
+    revision: safe.RevisionNumber = schema.example("00003")
+
+
+class ReleasePatchResults(schema.Strict):
+    endpoint: Literal["/release/patch"] = schema.alias("endpoint")
+    revision: view.Revision
+
+
 class ReleasePathsResults(schema.Strict):
     endpoint: Literal["/release/paths"] = schema.alias("endpoint")
     rel_paths: Sequence[str] = schema.example(["example/0.0.1/example-0.0.1-bin.tar.gz"])
 
 
+class ReleaseRevisionResults(schema.Strict):
+    endpoint: Literal["/release/revision"] = schema.alias("endpoint")
+    revision: view.Revision
+
+
 class ReleaseRevisionsResults(schema.Strict):
     endpoint: Literal["/release/revisions"] = schema.alias("endpoint")
-    revisions: Sequence[sql.Revision]
+    revisions: Sequence[view.Revision]
+
+
+class ReleaseSignaturesResults(schema.Strict):
+    endpoint: Literal["/release/signatures"] = schema.alias("endpoint")
+    revision: str = schema.example("00003")
+    signatures: dict[str, DeltaSignature]
 
 
 class ReleaseUploadArgs(schema.Strict):
@@ -769,9 +809,39 @@ class ReleaseUploadArgs(schema.Strict):
     expected_revision: safe.RevisionNumber | None = schema.default_example(None, "00003")
 
 
+class ReleaseUploadBatchFile(schema.Strict):
+    relpath: safe.RelPath = schema.example("example/0.0.1/example-0.0.1-bin.tar.gz.asc")
+    content: str = schema.example("This is the content of the file.")
+
+
+class ReleaseUploadBatchArgs(schema.Strict):
+    project: safe.ProjectKey = schema.example("example")
+    version: safe.VersionKey = schema.example("0.0.1")
+    files: list[ReleaseUploadBatchFile]
+    expected_revision: safe.RevisionNumber | None = schema.default_example(None, "00003")
+
+
+class ReleaseUploadBatchResults(schema.Strict):
+    endpoint: Literal["/release/upload/batch"] = schema.alias("endpoint")
+    revision: view.Revision
+
+
+class ReleaseUploadQuarantined(schema.Subset):
+    # The body of the 202 response to an upload held for archive validation, which has no endpoint
+    quarantined: Literal[True] = schema.example(True)
+    token: str = schema.example("0123456789abcdef0123456789abcdef")
+
+
 class ReleaseUploadResults(schema.Strict):
     endpoint: Literal["/release/upload"] = schema.alias("endpoint")
-    revision: sql.Revision
+    revision: view.Revision
+
+
+class ReleaseUploadStreamArgs(schema.Strict):
+    project: safe.ProjectKey = schema.example("example")
+    version: safe.VersionKey = schema.example("0.0.1")
+    relpath: safe.RelPath = schema.example("example/0.0.1/example-0.0.1-bin.tar.gz")
+    expected_revision: safe.RevisionNumber | None = schema.default_example(None, "00003")
 
 
 @dataclasses.dataclass
@@ -795,7 +865,7 @@ class SbomGenerateArgs(schema.Strict):
 
 class SbomGenerateResults(schema.Strict):
     endpoint: Literal["/sbom/generate"] = schema.alias("endpoint")
-    task: sql.Task
+    task: view.Task
 
 
 class SignatureProvenanceArgs(schema.Strict):
@@ -851,7 +921,7 @@ class SshKeysListResults(schema.Strict):
 
 class TaskGetResults(schema.Strict):
     endpoint: Literal["/task/get"] = schema.alias("endpoint")
-    task: sql.Task
+    task: view.Task
 
 
 @dataclasses.dataclass
@@ -863,7 +933,7 @@ class TasksListQuery:
 
 class TasksListResults(schema.Strict):
     endpoint: Literal["/admin/tasks/list"] = schema.alias("endpoint")
-    data: Sequence[sql.Task]
+    data: Sequence[view.Task]
     count: int = schema.example(10)
 
 
@@ -933,7 +1003,7 @@ class VoteStartArgs(schema.Strict):
 
 class VoteStartResults(schema.Strict):
     endpoint: Literal["/vote/start"] = schema.alias("endpoint")
-    task: sql.Task
+    task: view.Task
 
 
 class TrustedBallotEntry(schema.Strict):
@@ -1001,13 +1071,19 @@ type Results = Annotated[
     | PublisherReleaseAnnounceResults
     | PublisherSshRegisterResults
     | PublisherVoteResolveResults
+    | QuarantineGetResults
     | ReleaseAnnounceResults
+    | ReleaseAttestableResults
     | ReleaseCreateResults
     | ReleaseDeleteResults
     | ReleaseDraftDeleteResults
     | ReleaseGetResults
+    | ReleasePatchResults
     | ReleasePathsResults
+    | ReleaseRevisionResults
     | ReleaseRevisionsResults
+    | ReleaseSignaturesResults
+    | ReleaseUploadBatchResults
     | ReleaseUploadResults
     | ReleasesListResults
     | SbomGenerateResults
@@ -1026,63 +1102,74 @@ type Results = Annotated[
     schema.discriminator("endpoint"),
 ]
 
-ResultsAdapter = pydantic.TypeAdapter(Results)
-
-
-def validator[T](t: type[T]) -> Callable[[Any], T]:
-    def validate(value: Any) -> T:
-        obj = ResultsAdapter.validate_python(value)
-        if not isinstance(obj, t):
-            raise ResultsTypeError(f"Invalid API response: {value}")
-        return obj
-
-    return validate
-
-
-validate_checks_list = validator(ChecksListResults)
-validate_checks_ongoing = validator(ChecksOngoingResults)
-validate_committee_get = validator(CommitteeGetResults)
-validate_committee_keys = validator(CommitteeKeysResults)
-validate_committee_projects = validator(CommitteeProjectsResults)
-validate_committees_list = validator(CommitteesListResults)
-validate_distribution_list = validator(DistributionListResults)
-validate_distribution_record = validator(DistributionRecordResults)
-validate_distribution_ssh_register = validator(DistributeSshRegisterResults)
-validate_ignore_add = validator(IgnoreAddResults)
-validate_ignore_delete = validator(IgnoreDeleteResults)
-validate_ignore_list = validator(IgnoreListResults)
-validate_jwt_create = validator(JwtCreateResults)
-validate_key_add = validator(KeyAddResults)
-validate_key_delete = validator(KeyDeleteResults)
-validate_key_get = validator(KeyGetResults)
-validate_keys_upload = validator(KeysUploadResults)
-validate_keys_user = validator(KeysUserResults)
-validate_project_get = validator(ProjectGetResults)
-validate_project_releases = validator(ProjectReleasesResults)
-validate_projects_list = validator(ProjectsListResults)
-validate_publisher_distribution_record = validator(PublisherDistributionRecordResults)
-validate_publisher_release_announce = validator(PublisherReleaseAnnounceResults)
-validate_publisher_ssh_register = validator(PublisherSshRegisterResults)
-validate_publisher_vote_resolve = validator(PublisherVoteResolveResults)
-validate_release_announce = validator(ReleaseAnnounceResults)
-validate_release_create = validator(ReleaseCreateResults)
-validate_release_delete = validator(ReleaseDeleteResults)
-validate_release_draft_delete = validator(ReleaseDraftDeleteResults)
-validate_release_get = validator(ReleaseGetResults)
-validate_release_paths = validator(ReleasePathsResults)
-validate_release_revisions = validator(ReleaseRevisionsResults)
-validate_release_upload = validator(ReleaseUploadResults)
-validate_releases_list = validator(ReleasesListResults)
-validate_sbom_generate = validator(SbomGenerateResults)
-validate_signature_provenance = validator(SignatureProvenanceResults)
-validate_ssh_key_add = validator(SshKeyAddResults)
-validate_ssh_key_delete = validator(SshKeyDeleteResults)
-validate_ssh_keys_list = validator(SshKeysListResults)
-validate_task_get = validator(TaskGetResults)
-validate_tasks_list = validator(TasksListResults)
-validate_user_info = validator(UserInfoResults)
-validate_users_list = validator(UsersListResults)
-validate_vote_cast = validator(VoteCastResults)
-validate_vote_resolve = validator(VoteResolveResults)
-validate_vote_start = validator(VoteStartResults)
-validate_vote_tabulate = validator(VoteTabulateResults)
+
+class Validator[T]:
+    # Each endpoint has its own adapter, built on first use, instead of one adapter for the whole Results union
+    def __init__(self, t: type[T]) -> None:
+        self.t = t
+
+    def __call__(self, value: Any) -> T:
+        return self.adapter.validate_python(value)
+
+    @functools.cached_property
+    def adapter(self) -> pydantic.TypeAdapter[T]:
+        return pydantic.TypeAdapter(self.t)
+
+    def json(self, data: bytes | str) -> T:
+        return self.adapter.validate_json(data)
+
+
+validate_checks_list = Validator(ChecksListResults)
+validate_checks_ongoing = Validator(ChecksOngoingResults)
+validate_committee_get = Validator(CommitteeGetResults)
+validate_committee_keys = Validator(CommitteeKeysResults)
+validate_committee_projects = Validator(CommitteeProjectsResults)
+validate_committees_list = Validator(CommitteesListResults)
+validate_distribution_list = Validator(DistributionListResults)
+validate_distribution_record = Validator(DistributionRecordResults)
+validate_distribution_ssh_register = Validator(DistributeSshRegisterResults)
+validate_ignore_add = Validator(IgnoreAddResults)
+validate_ignore_delete = Validator(IgnoreDeleteResults)
+validate_ignore_list = Validator(IgnoreListResults)
+validate_jwt_create = Validator(JwtCreateResults)
+validate_key_add = Validator(KeyAddResults)
+validate_key_delete = Validator(KeyDeleteResults)
+validate_key_get = Validator(KeyGetResults)
+validate_keys_upload = Validator(KeysUploadResults)
+validate_keys_user = Validator(KeysUserResults)
+validate_project_get = Validator(ProjectGetResults)
+validate_project_releases = Validator(ProjectReleasesResults)
+validate_projects_list = Validator(ProjectsListResults)
+validate_publisher_distribution_record = Validator(PublisherDistributionRecordResults)
+validate_publisher_release_announce = Validator(PublisherReleaseAnnounceResults)
+validate_publisher_ssh_register = Validator(PublisherSshRegisterResults)
+validate_publisher_vote_resolve = Validator(PublisherVoteResolveResults)
+validate_quarantine_get = Validator(QuarantineGetResults)
+validate_release_announce = Validator(ReleaseAnnounceResults)
+validate_release_attestable = Validator(ReleaseAttestableResults)
+validate_release_create = Validator(ReleaseCreateResults)
+validate_release_delete = Validator(ReleaseDeleteResults)
+validate_release_draft_delete = Validator(ReleaseDraftDeleteResults)
+validate_release_get = Validator(ReleaseGetResults)
+validate_release_patch = Validator(ReleasePatchResults)
+validate_release_paths = Validator(ReleasePathsResults)
+validate_release_revision = Validator(ReleaseRevisionResults)
+validate_release_revisions = Validator(ReleaseRevisionsResults)
+validate_release_signatures = Validator(ReleaseSignaturesResults)
+validate_release_upload = Validator(ReleaseUploadResults)
+validate_release_upload_batch = Validator(ReleaseUploadBatchResults)
+validate_release_upload_quarantined = Validator(ReleaseUploadQuarantined)
+validate_releases_list = Validator(ReleasesListResults)
+validate_sbom_generate = Validator(SbomGenerateResults)
+validate_signature_provenance = Validator(SignatureProvenanceResults)
+validate_ssh_key_add = Validator(SshKeyAddResults)
+validate_ssh_key_delete = Validator(SshKeyDeleteResults)
+validate_ssh_keys_list = Validator(SshKeysListResults)
+validate_task_get = Validator(TaskGetResults)
+validate_tasks_list = Validator(TasksListResults)
+validate_user_info = Validator(UserInfoResults)
+validate_users_list = Validator(UsersListResults)
+validate_vote_cast = Validator(VoteCastResults)
+validate_vote_resolve = Validator(VoteResolveResults)
+validate_vote_start = Validator(VoteStartResults)
+validate_vote_tabulate = Validator(VoteTabulateResults)
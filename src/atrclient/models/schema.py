@@ -29,13 +29,18 @@ class Lax(pydantic.BaseModel):
 
 
 class Strict(pydantic.BaseModel):
-    model_config = pydantic.ConfigDict(extra="forbid", strict=True, validate_assignment=True)
+    # Schemas are built on first use, so importing many models does not pay for all of them
+    model_config = pydantic.ConfigDict(defer_build=True, extra="forbid", strict=True, validate_assignment=True)
 
 
 class Subset(pydantic.BaseModel):
     model_config = pydantic.ConfigDict(extra="ignore", strict=False, validate_assignment=True, validate_by_name=True)
 
 
+class Frozen(pydantic.BaseModel):
+    model_config = pydantic.ConfigDict(extra="ignore", frozen=True, from_attributes=True, strict=False)
+
+
 class Form(pydantic.BaseModel):
     model_config = pydantic.ConfigDict(
         extra="forbid",
@@ -0,0 +1,162 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+"""Read only views of database rows, as returned by the API without the ORM."""
+
+# Each view mirrors the columns of the sql model with the same name, and omits its relationships
+# The tests check that the views and enums stay in step with the sql models
+
+import datetime
+import enum
+from typing import Annotated, Any
+
+import pydantic
+
+from . import safe, schema
+
+
+class CheckResultStatus(enum.StrEnum):
+    BLOCKER = "blocker"
+    CONCERN = "concern"
+    EXCEPTION = "exception"
+    NOTE = "note"
+    SUGGESTION = "suggestion"
+
+
+class QuarantineStatus(enum.Enum):
+    STAGING = "STAGING"
+    PENDING = "PENDING"
+    FAILED = "FAILED"
+    ACKNOWLEDGED = "ACKNOWLEDGED"
+
+
+class ReleasePhase(enum.StrEnum):
+    RELEASE_CANDIDATE_DRAFT = "release_candidate_draft"
+    RELEASE_CANDIDATE = "release_candidate"
+    RELEASE_PREVIEW = "release_preview"
+    RELEASE = "release"
+
+
+class TaskStatus(enum.StrEnum):
+    QUEUED = "queued"
+    ACTIVE = "active"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
+def timestamp_now() -> datetime.datetime:
+    return datetime.datetime.now(datetime.UTC)
+
+
+def timestamp_from_iso(value: Any) -> Any:
+    # The same conversion as in the model_post_init methods of the sql models
+    if isinstance(value, str):
+        return datetime.datetime.fromisoformat(value.rstrip("Z"))
+    return value
+
+
+type Timestamp = Annotated[datetime.datetime, pydantic.BeforeValidator(timestamp_from_iso)]
+
+
+class CheckResult(schema.Frozen):
+    id: int | None = schema.default_example(None, 123)
+    release_key: str = schema.example("example-0.0.1")
+    revision_number: str | None = schema.default_example(None, "00005")
+    checker: str = schema.example("atr.tasks.checks.license.files")
+    checker_version: str | None = schema.default_example(None, "2")
+    primary_rel_path: str | None = schema.default_example(None, "apache-example-0.0.1-source.tar.gz")
+    member_rel_path: str | None = schema.default_example(None, "apache-example-0.0.1/pom.xml")
+    created: Timestamp
+    status: CheckResultStatus = schema.default_example(CheckResultStatus.NOTE, CheckResultStatus.NOTE)
+    message: str = schema.example("sha512 matches for apache-example-0.0.1/pom.xml")
+    data: Any = None
+    inputs_hash: str | None = schema.default_example(None, "blake3:7f83b1657ff1fc...")
+    cached: bool = schema.default_example(False, False)
+
+    @property
+    def safe_primary_rel_path(self) -> safe.RelPath | None:
+        """Get the typesafe validated relative path for the check result, if set."""
+        return safe.RelPath(self.primary_rel_path) if self.primary_rel_path else None
+
+
+class QuarantineFileEntry(schema.Frozen):
+    version: int = 1
+    rel_path: str
+    size_bytes: int
+    content_hash: str
+    errors: list[str] = schema.factory(list)
+
+
+class Quarantined(schema.Frozen):
+    id: int | None = None
+    release_key: str = schema.example("example-0.0.1")
+    asf_uid: str = schema.example("user")
+    prior_revision_key: str | None = schema.default_example(None, "example-0.0.1 00005")
+    status: QuarantineStatus = schema.default_example(QuarantineStatus.PENDING, QuarantineStatus.PENDING)
+    token: str = schema.example("0123456789abcdef0123456789abcdef")
+    created: Timestamp = schema.factory(timestamp_now)
+    completed: Timestamp | None = None
+    file_metadata: list[QuarantineFileEntry] | None = None
+    use_check_cache: bool = schema.default_example(True, True)
+    description: str | None = schema.default_example(None, "Upload from web compose flow")
+
+
+class Revision(schema.Frozen):
+    key: str = schema.default_example("", "example-0.0.1 00002")
+    release_key: str | None = schema.default_example(None, "example-0.0.1")
+    seq: int = schema.default_example(0, 1)
+    number: str = schema.default_example("", "00002")
+    asfuid: str = schema.example("user")
+    created: Timestamp = schema.factory(timestamp_now)
+    phase: ReleasePhase = schema.example(ReleasePhase.RELEASE_CANDIDATE_DRAFT)
+    parent_key: str | None = schema.default_example(None, "example-0.0.1 00001")
+    description: str | None = schema.default_example(None, "This is a description")
+    merge_base_revision_key: str | None = schema.default_example(None, "example-0.0.1 00001")
+    tag: str | None = schema.default_example(None, "rc1")
+    was_quarantined: bool = schema.default_example(False, False)
+
+    @property
+    def safe_number(self) -> safe.RevisionNumber:
+        """Get the typesafe validated number for the revision"""
+        return safe.RevisionNumber(self.number)
+
+
+class Task(schema.Frozen):
+    id: int | None = None
+    status: TaskStatus = TaskStatus.QUEUED
+    # Kept as a string so that task types added to the server do not fail to decode
+    task_type: str
+    task_args: Any = None
+    inputs_hash: str | None = schema.default_example(None, "blake3:7f83b1657ff1fc...")
+    asf_uid: str
+    added: Timestamp = schema.factory(timestamp_now)
+    scheduled: Timestamp | None = None
+    started: Timestamp | None = None
+    pid: int | None = None
+    completed: Timestamp | None = None
+    # The client only displays task results, so they are not validated against results.Results
+    result: Any = None
+    error: str | None = None
+    project_key: str | None = None
+    version_key: str | None = None
+    revision_number: str | None = None
+    primary_rel_path: str | None = None
+
+    @property
+    def safe_primary_rel_path(self) -> safe.RelPath | None:
+        """Get the typesafe validated relative path for the task, if set."""
+        return safe.RelPath(self.primary_rel_path) if self.primary_rel_path else None
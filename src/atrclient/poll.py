@@ -0,0 +1,84 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+from __future__ import annotations
+
+import asyncio
+import random
+import time
+from typing import Final
+
+BACKOFF_FACTOR: Final[float] = 2.0
+BACKOFF_JITTER: Final[float] = 0.2
+
+
+class Backoff:
+    def __init__(
+        self, initial: float, maximum: float, factor: float = BACKOFF_FACTOR, jitter: float = BACKOFF_JITTER
+    ) -> None:
+        self.initial = initial
+        self.maximum = max(initial, maximum)
+        self.factor = factor
+        self.jitter = jitter
+        self.current = initial
+
+    def delay(self) -> float:
+        # Jitter only ever shortens the delay, so the maximum is never exceeded
+        delay = self.current * (1 - (self.jitter * random.random()))
+        self.current = min(self.current * self.factor, self.maximum)
+        return delay
+
+    def reset(self) -> None:
+        self.current = self.initial
+
+
+class Deadline:
+    def __init__(self, timeout: float) -> None:
+        self.start = time.monotonic()
+        self.end = self.start + timeout
+
+    def elapsed(self) -> float:
+        return time.monotonic() - self.start
+
+    def expired(self) -> bool:
+        return time.monotonic() >= self.end
+
+    def remaining(self) -> float:
+        return max(0.0, self.end - time.monotonic())
+
+
+class Drain:
+    def __init__(self) -> None:
+        self.first: int | None = None
+
+    def update(self, remaining: int, elapsed: float) -> float:
+        # The average rate at which the remaining count has fallen since the first update
+        if self.first is None:
+            self.first = remaining
+        return ((self.first - remaining) / elapsed) if (elapsed > 0) else 0.0
+
+
+async def pause(seconds: float) -> None:
+    await asyncio.sleep(seconds)
+
+
+async def wait(backoff: Backoff, deadline: Deadline) -> bool:
+    # Never sleeps beyond the deadline, so the caller gets one last poll at the deadline itself
+    if deadline.expired():
+        return False
+    await pause(min(backoff.delay(), deadline.remaining()))
+    return True
@@ -19,11 +19,16 @@ from __future__ import annotations
 
 import json
 import sys
-from typing import NoReturn
+from typing import TYPE_CHECKING, NoReturn
 
-import atrclient.basic as basic
 import atrclient.config as config
-import atrclient.models.schema as schema
+import atrclient.lazy as lazy
+
+if TYPE_CHECKING:
+    import atrclient.basic as basic
+    import atrclient.models.schema as schema
+else:
+    schema = lazy.module("atrclient.models.schema")
 
 
 def error_and_exit(message: str, code: int = 1) -> NoReturn:
@@ -33,7 +38,7 @@ def error_and_exit(message: str, code: int = 1) -> NoReturn:
 
 
 def json_or_message(data: basic.JSON | schema.Strict, message: str | None = None) -> None:
-    cfg = config.read()
+    cfg = config.snapshot()
     output_json = config.get(cfg, ["output", "json"])
     if (output_json is True) or (message is None):
         if isinstance(data, schema.Strict):
@@ -44,6 +49,19 @@ def json_or_message(data: basic.JSON | schema.Strict, message: str | None = None
         print(message)
 
 
+def progress(message: str) -> None:
+    # Progress is rewritten in place on a terminal, and omitted from logs
+    if sys.stderr.isatty():
+        sys.stderr.write(f"\r\x1b[K{message}")
+        sys.stderr.flush()
+
+
+def progress_end() -> None:
+    if sys.stderr.isatty():
+        sys.stderr.write("\r\x1b[K")
+        sys.stderr.flush()
+
+
 def warning(message: str) -> None:
     sys.stderr.write(f"atr: warning: {message}\n")
     sys.stderr.flush()
@@ -17,13 +17,15 @@
 
 from __future__ import annotations
 
+import hashlib
+import pathlib
 import time
 from typing import TYPE_CHECKING, Final
 
 import openpgp
 
 if TYPE_CHECKING:
-    import pathlib
+    from collections.abc import Callable, Iterable, Sequence
 
 CERTIFICATION_SIGNATURE_TYPES: Final[frozenset[str]] = frozenset(
     {"cert-generic", "cert-persona", "cert-casual", "cert-positive"}
@@ -83,11 +85,50 @@ def select_signing_component(key: openpgp.SecretKey) -> openpgp.SecretKey | open
     return None
 
 
-def sign_detached(data: bytes, component: openpgp.SecretKey | openpgp.SecretSubkey, password: str | None) -> str:
+def sign_batch(key_data: bytes, fingerprint: str, password: str | None, paths: list[str]) -> list[str]:
+    # Runs in a worker process, and parses the key once for every file in the batch
+    key = openpgp.SecretKey.from_bytes(key_data)
+    component = _component_by_fingerprint(key, fingerprint)
+    return [sign_detached(pathlib.Path(path), component, password) for path in paths]
+
+
+def sign_detached(
+    source: bytes | pathlib.Path | Iterable[bytes],
+    component: openpgp.SecretKey | openpgp.SecretSubkey,
+    password: str | None,
+    update: Callable[[bytes], None] | None = None,
+) -> str:
+    data = _source_bytes(source)
+    if update is not None:
+        # Checksums are taken from the bytes that are signed, so the file is only read once
+        update(data)
     signature = openpgp.DetachedSignature.sign_binary(data, component, password=password, hash_algorithm="sha512")
     return signature.to_armored()
 
 
+def sign_detached_digests(
+    source: bytes | pathlib.Path | Iterable[bytes],
+    component: openpgp.SecretKey | openpgp.SecretSubkey,
+    password: str | None,
+    algorithms: Sequence[str],
+) -> tuple[str, dict[str, str]]:
+    hashers = {algorithm: hashlib.new(algorithm) for algorithm in algorithms}
+
+    def update(data: bytes) -> None:
+        for hasher in hashers.values():
+            hasher.update(data)
+
+    armored = sign_detached(source, component, password, update)
+    return armored, {algorithm: hasher.hexdigest() for algorithm, hasher in hashers.items()}
+
+
+def _component_by_fingerprint(key: openpgp.SecretKey, fingerprint: str) -> openpgp.SecretKey | openpgp.SecretSubkey:
+    for subkey in key.secret_subkeys:
+        if subkey.fingerprint == fingerprint:
+            return subkey
+    return key
+
+
 def _effective_self_signature(key: openpgp.SecretKey, now: int) -> openpgp.SignatureInfo | None:
     fingerprint = key.fingerprint.lower()
     key_id = key.key_id.lower()
@@ -181,6 +222,17 @@ def _signature_is_self(signature: openpgp.SignatureInfo, fingerprint: str, key_i
     return (fingerprint in fingerprints) or (key_id in key_ids)
 
 
+def _source_bytes(source: bytes | pathlib.Path | Iterable[bytes]) -> bytes:
+    # The openpgp signer only accepts bytes, so this is the single copy of the data held in memory
+    match source:
+        case bytes():
+            return source
+        case pathlib.Path():
+            return source.read_bytes()
+        case _:
+            return b"".join(source)
+
+
 def _subkey_usable(subkey: openpgp.SecretSubkey, now: int) -> bool:
     if any(signature.signature_type == SUBKEY_REVOCATION_SIGNATURE_TYPE for signature in subkey.signatures):
         return False
@@ -0,0 +1,105 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+from __future__ import annotations
+
+import asyncio
+from typing import TYPE_CHECKING, Final
+
+import atrclient.poll as poll
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator, Iterable
+
+    import atrclient.api as api
+    import atrclient.models as models
+
+INTERVAL_INITIAL: Final[float] = 0.5
+INTERVAL_MAXIMUM: Final[float] = 10.0
+# Values of models.view.QuarantineStatus
+QUARANTINE_FAILED_STATUSES: Final[frozenset[str]] = frozenset({"ACKNOWLEDGED", "FAILED"})
+# Values of models.view.TaskStatus
+TERMINAL_STATUSES: Final[frozenset[str]] = frozenset({"completed", "failed"})
+
+
+async def follow(atr: api.AsyncClient, task: models.view.Task, deadline: poll.Deadline) -> models.view.Task:
+    # Each task has its own backoff, which starts again when the task changes status
+    backoff = poll.Backoff(INTERVAL_INITIAL, INTERVAL_MAXIMUM)
+    while task.status not in TERMINAL_STATUSES:
+        if not await poll.wait(backoff, deadline):
+            break
+        latest = (await atr.task_get(str(task.id))).task
+        if latest.status != task.status:
+            backoff.reset()
+        task = latest
+    return task
+
+
+async def quarantine_follow(
+    atr: api.AsyncClient, project: str, version: str, token: str, deadline: poll.Deadline
+) -> models.api.QuarantineGetResults:
+    # One status call per poll, which also carries the number of any revision created from the upload
+    backoff = poll.Backoff(INTERVAL_INITIAL, INTERVAL_MAXIMUM)
+    held = await atr.quarantine_get(project, version, token)
+    while not quarantine_resolved(held):
+        if not await poll.wait(backoff, deadline):
+            break
+        latest = await atr.quarantine_get(project, version, token)
+        if latest.quarantined.status != held.quarantined.status:
+            backoff.reset()
+        held = latest
+    return held
+
+
+def quarantine_failed(held: models.api.QuarantineGetResults) -> bool:
+    return held.quarantined.status.value in QUARANTINE_FAILED_STATUSES
+
+
+def quarantine_resolved(held: models.api.QuarantineGetResults) -> bool:
+    return (held.revision is not None) or quarantine_failed(held)
+
+
+async def quarantines(
+    atr: api.AsyncClient, project: str, version: str, tokens: Iterable[str], deadline: poll.Deadline
+) -> list[models.api.QuarantineGetResults]:
+    return await asyncio.gather(*(quarantine_follow(atr, project, version, token, deadline) for token in tokens))
+
+
+async def revision_follow(
+    atr: api.AsyncClient, project: str, version: str, revision_before: str | None, count: int, deadline: poll.Deadline
+) -> str | None:
+    # For servers without quarantine status, waits until the latest revision accounts for every upload
+    backoff = poll.Backoff(INTERVAL_INITIAL, INTERVAL_MAXIMUM)
+    target = int(revision_before or 0) + count
+    while True:
+        latest = (await atr.release_get(project, version)).release.latest_revision_number
+        if (latest is not None) and (int(latest) >= target):
+            return latest
+        if not await poll.wait(backoff, deadline):
+            return None
+
+
+def terminal(task: models.view.Task) -> bool:
+    return task.status in TERMINAL_STATUSES
+
+
+async def track(
+    atr: api.AsyncClient, tasks: Iterable[models.view.Task], deadline: poll.Deadline
+) -> AsyncIterator[models.view.Task]:
+    # Yields every task as soon as it finishes, and any unfinished tasks once the deadline passes
+    for finished in asyncio.as_completed([follow(atr, task, deadline) for task in tasks]):
+        yield await finished
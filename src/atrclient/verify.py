@@ -0,0 +1,122 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+from __future__ import annotations
+
+import asyncio
+import concurrent.futures
+import dataclasses
+import hashlib
+import math
+import multiprocessing
+import pathlib
+
+import openpgp
+
+import atrclient.api as api
+import atrclient.models as models
+import atrclient.web as web
+
+
+@dataclasses.dataclass
+class Outcome:
+    artifact: str
+    valid: bool
+    fingerprint: str | None = None
+    issue: str | None = None
+
+
+def batch(key_asc_text: str, fingerprint: str, paths: list[tuple[str, str]]) -> list[Outcome]:
+    # Runs in a worker process, and parses the key once for every signature in the batch
+    key, _ = openpgp.PublicKey.from_armor(key_asc_text)
+    outcomes = []
+    for rel_path, path in paths:
+        issues = []
+        signatures = signatures_parse(pathlib.Path(path + ".asc").read_bytes())
+        for signature in signatures:
+            try:
+                signature.verify_file(key, path)
+            except ValueError as e:
+                issues.append(str(e))
+        if not signatures:
+            issues.append("The signature file contains no signatures")
+        outcomes.append(Outcome(rel_path, not issues, fingerprint, "; ".join(issues) or None))
+    return outcomes
+
+
+def issuer(signature_data: bytes) -> str:
+    try:
+        signatures = signatures_parse(signature_data)
+    except ValueError:
+        return ""
+    issuers = set()
+    for signature in signatures:
+        info = signature.signature_info()
+        issuers.update(value.lower() for value in (info.issuer_fingerprints or info.issuer_key_ids))
+    return ",".join(sorted(issuers))
+
+
+def pairs(root: pathlib.Path) -> list[str]:
+    rel_paths = {path.relative_to(root).as_posix() for path in root.rglob("*") if path.is_file()}
+    return sorted(rel_path for rel_path in rel_paths if f"{rel_path}.asc" in rel_paths)
+
+
+async def provenances(
+    root: pathlib.Path, groups: dict[str, list[str]]
+) -> dict[str, models.api.SignatureProvenanceResults]:
+    # One provenance request per signing key, using any one of the signatures that it made
+    async def provenance(rel_path: str) -> models.api.SignatureProvenanceResults:
+        signature_data = (root / f"{rel_path}.asc").read_bytes()
+        provenance_args = models.api.SignatureProvenanceArgs(
+            signature_file_name=pathlib.PurePosixPath(f"{rel_path}.asc").name,
+            signature_asc_text=signature_data.decode("utf-8", errors="ignore"),
+            signature_sha3_256=hashlib.sha3_256(signature_data).hexdigest(),
+        )
+        return await atr.signature_provenance(provenance_args)
+
+    async with api.AsyncClient() as atr:
+        results = await asyncio.gather(*(provenance(rel_paths[0]) for rel_paths in groups.values()))
+    return dict(zip(groups, results, strict=True))
+
+
+def run(root: pathlib.Path, rel_paths: list[str], jobs: int) -> list[Outcome]:
+    groups: dict[str, list[str]] = {}
+    for rel_path in rel_paths:
+        groups.setdefault(issuer((root / f"{rel_path}.asc").read_bytes()), []).append(rel_path)
+    keys = web.run(provenances(root, groups))
+
+    outcomes = []
+    # Forking is unsafe once the HTTP session has started threads
+    context = multiprocessing.get_context("spawn")
+    with concurrent.futures.ProcessPoolExecutor(max_workers=jobs, mp_context=context) as executor:
+        futures = []
+        for group_issuer, group in groups.items():
+            provenance = keys[group_issuer]
+            size = math.ceil(len(group) / jobs)
+            for start in range(0, len(group), size):
+                paths = [(rel_path, str(root / rel_path)) for rel_path in group[start : start + size]]
+                futures.append(executor.submit(batch, provenance.key_asc_text, provenance.fingerprint, paths))
+        for future in futures:
+            outcomes.extend(future.result())
+    return sorted(outcomes, key=lambda outcome: outcome.artifact)
+
+
+def signatures_parse(signature_data: bytes) -> list[openpgp.DetachedSignature]:
+    if signature_data.lstrip().startswith(b"-----BEGIN"):
+        signatures, _ = openpgp.DetachedSignature.from_armor_many(signature_data.decode("utf-8", errors="ignore"))
+        return signatures
+    return openpgp.DetachedSignature.from_bytes_many(signature_data)
@@ -17,48 +17,275 @@
 
 from __future__ import annotations
 
+import asyncio
+import atexit
+import contextlib
 import json
-from typing import TYPE_CHECKING
-
-import aiohttp
+import os
+import shutil
+import weakref
+from typing import TYPE_CHECKING, Any, Final
 
 import atrclient.basic as basic
-import atrclient.models.schema as schema
+import atrclient.lazy as lazy
 import atrclient.show as show
 
 if TYPE_CHECKING:
     import pathlib
+    from collections.abc import AsyncIterator, Callable, Coroutine, Iterator
+    from typing import BinaryIO
+
+    import aiohttp
+    import pydantic_core
+
+    import atrclient.models.schema as schema
+else:
+    aiohttp = lazy.module("aiohttp")
+    pydantic_core = lazy.module("pydantic_core")
+
+CONNECTION_LIMIT: Final[int] = 32
+DNS_CACHE_SECONDS: Final[int] = 300
+DOWNLOAD_CHUNK_SIZE: Final[int] = 64 * 1024
+ENDPOINT_MISSING_STATUSES: Final[frozenset[int]] = frozenset({404, 405})
+EVENTS_READ_SECONDS: Final[float] = 60.0
+KEEPALIVE_SECONDS: Final[float] = 30.0
+
+
+class EndpointMissingError(Exception):
+    # Raised for optional endpoints that an older server does not have, so that the caller can fall back
+    def __init__(self, url: str) -> None:
+        super().__init__(f"Endpoint not available: {url}")
+        self.url = url
+
+
+class SessionPool:
+    def __init__(self) -> None:
+        self.runner: asyncio.Runner | None = None
+        self.sessions: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, dict[bool, aiohttp.ClientSession]] = (
+            weakref.WeakKeyDictionary()
+        )
+        self.users: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, int] = weakref.WeakKeyDictionary()
+
+    def acquire(self) -> None:
+        loop = asyncio.get_running_loop()
+        self.users[loop] = self.users.get(loop, 0) + 1
+
+    def close(self) -> None:
+        if self.runner is None:
+            return
+        runner = self.runner
+        self.runner = None
+        try:
+            runner.run(self.sessions_close())
+        finally:
+            runner.close()
+
+    async def release(self) -> None:
+        loop = asyncio.get_running_loop()
+        users = self.users.get(loop, 0) - 1
+        if users > 0:
+            self.users[loop] = users
+            return
+        self.users.pop(loop, None)
+        # Sessions on the runner loop also serve the sync wrappers, so they stay open until close at exit
+        if (self.runner is not None) and (self.runner.get_loop() is loop):
+            return
+        await self.sessions_close()
+
+    def run[T](self, coroutine: Coroutine[Any, Any, T]) -> T:
+        if self.runner is None:
+            self.runner = asyncio.Runner()
+        try:
+            return self.runner.run(coroutine)
+        except BaseException:
+            # SystemExit from a child task stops the loop, so cancel what it left behind
+            self.tasks_cancel(self.runner.get_loop())
+            raise
+
+    def session(self, verify_ssl: bool = True) -> aiohttp.ClientSession:
+        loop = asyncio.get_running_loop()
+        sessions = self.sessions.setdefault(loop, {})
+        session = sessions.get(verify_ssl)
+        if (session is None) or session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=CONNECTION_LIMIT,
+                ttl_dns_cache=DNS_CACHE_SECONDS,
+                keepalive_timeout=KEEPALIVE_SECONDS,
+                ssl=verify_ssl,
+            )
+            session = aiohttp.ClientSession(connector=connector)
+            sessions[verify_ssl] = session
+        return session
+
+    async def sessions_close(self) -> None:
+        sessions = self.sessions.pop(asyncio.get_running_loop(), {})
+        for session in sessions.values():
+            await session.close()
+
+    def tasks_cancel(self, loop: asyncio.AbstractEventLoop) -> None:
+        tasks = [task for task in asyncio.all_tasks(loop) if not task.done()]
+        for task in tasks:
+            task.cancel()
+        for task in tasks:
+            with contextlib.suppress(BaseException):
+                loop.run_until_complete(task)
 
 
-async def download(url: str, target: pathlib.Path, verify_ssl: bool = True) -> None:
-    connector = None if verify_ssl else aiohttp.TCPConnector(ssl=False)
+POOL: Final[SessionPool] = SessionPool()
+atexit.register(POOL.close)
+
+
+@contextlib.contextmanager
+def client_errors(url: str) -> Iterator[None]:
+    # Applied to every API request, so callers of AsyncClient do not each need to handle aiohttp errors
     try:
-        file = target.open("xb")
-    except FileExistsError:
+        yield
+    except aiohttp.ClientError as e:
+        show.error_and_exit(f"Request failed: {url}\n{e}")
+
+
+async def download(
+    url: str,
+    target: pathlib.Path,
+    verify_ssl: bool = True,
+    chunk_size: int = DOWNLOAD_CHUNK_SIZE,
+    segments: int = 1,
+    update: Callable[[bytes], object] | None = None,
+) -> int:
+    if target.exists():
         show.error_and_exit(f"File already exists: {target}")
+    # Content can only be passed to update in order when there is a single segment
+    size = (await download_size(url, verify_ssl)) if ((segments > 1) and (update is None)) else None
+    if (size is None) or (size < (segments * chunk_size)):
+        bounds: list[tuple[int, int | None]] = [(0, None)]
+    else:
+        starts = [(size * index) // segments for index in range(segments)]
+        bounds = list(zip(starts, [*starts[1:], size], strict=True))
+
+    paths = [download_part_path(target, start) for start, _end in bounds]
+    received = await asyncio.gather(
+        *(
+            download_segment(url, path, start, end, verify_ssl, chunk_size, update)
+            for path, (start, end) in zip(paths, bounds, strict=True)
+        )
+    )
+    with paths[0].open("ab") as file:
+        for path in paths[1:]:
+            with path.open("rb") as segment:
+                shutil.copyfileobj(segment, file)
+            path.unlink()
+    if (size is not None) and (paths[0].stat().st_size != size):
+        show.error_and_exit(f"Incomplete download: {url}")
     try:
-        async with aiohttp.ClientSession(connector=connector) as session:
-            async with session.get(url, allow_redirects=False) as response:
-                if response.status != 200:
-                    show.error_and_exit(f"Not a downloadable file: {response.status} {url}")
-                if response.headers.get("Content-Type") != "application/octet-stream":
-                    show.error_and_exit(f"Not a downloadable file: {url}")
-                async for chunk in response.content.iter_chunked(65536):
-                    file.write(chunk)
-    except BaseException:
-        target.unlink(missing_ok=True)
-        raise
-    finally:
-        file.close()
-
-
-async def get(url: str, jwt_token: str | None, verify_ssl: bool = True) -> basic.JSON:
-    connector = None if verify_ssl else aiohttp.TCPConnector(ssl=False)
+        target.hardlink_to(paths[0])
+    except FileExistsError:
+        show.error_and_exit(f"File already exists: {target}")
+    except OSError:
+        # Without hard links, creating the target exclusively reserves its name before it is replaced
+        try:
+            target.touch(exist_ok=False)
+        except FileExistsError:
+            show.error_and_exit(f"File already exists: {target}")
+        os.replace(paths[0], target)
+        return sum(received)
+    paths[0].unlink()
+    return sum(received)
+
+
+def download_part_path(target: pathlib.Path, start: int) -> pathlib.Path:
+    suffix = ".part" if (start == 0) else f".part.{start}"
+    return target.with_name(target.name + suffix)
+
+
+async def download_segment(
+    url: str,
+    path: pathlib.Path,
+    start: int,
+    end: int | None,
+    verify_ssl: bool,
+    chunk_size: int,
+    update: Callable[[bytes], object] | None = None,
+) -> int:
+    offset = path.stat().st_size if path.exists() else 0
+    position = start + offset
+    if (end is not None) and (position >= end):
+        if position > end:
+            # Left over from an attempt which used different segment boundaries
+            with path.open("r+b") as file:
+                file.truncate(end - start)
+        return 0
     headers = {}
-    if jwt_token is not None:
-        headers["Authorization"] = f"Bearer {jwt_token}"
-    async with aiohttp.ClientSession(connector=connector, headers=headers) as session:
-        async with session.get(url) as resp:
+    if position or (end is not None):
+        headers["Range"] = f"bytes={position}-" + ("" if (end is None) else str(end - 1))
+
+    async with session(verify_ssl).get(url, headers=headers, allow_redirects=False) as response:
+        mode = download_segment_mode(response, url, position, end)
+        if (update is not None) and (mode != "wb") and position:
+            with path.open("rb") as file:
+                while chunk := file.read(chunk_size):
+                    update(chunk)
+        if mode is None:
+            return 0
+        received = 0
+        with path.open(mode) as file:
+            async for chunk in response.content.iter_chunked(chunk_size):
+                file.write(chunk)
+                if update is not None:
+                    update(chunk)
+                received += len(chunk)
+        return received
+
+
+def download_segment_mode(response: aiohttp.ClientResponse, url: str, position: int, end: int | None) -> str | None:
+    if (response.status == 416) and (end is None) and position:
+        # The partial file from a previous attempt may already be complete
+        if response.headers.get("Content-Range") == f"bytes */{position}":
+            return None
+    if response.status not in (200, 206):
+        show.error_and_exit(f"Not a downloadable file: {response.status} {url}")
+    if response.headers.get("Content-Type") != "application/octet-stream":
+        show.error_and_exit(f"Not a downloadable file: {url}")
+    if response.status == 200:
+        if end is not None:
+            show.error_and_exit(f"Server does not support ranged downloads: {url}")
+        # The server ignored any range, so the download restarts from the beginning
+        return "wb"
+    if not response.headers.get("Content-Range", "").startswith(f"bytes {position}-"):
+        show.error_and_exit(f"Unexpected Content-Range from {url}")
+    return "ab"
+
+
+async def download_size(url: str, verify_ssl: bool = True) -> int | None:
+    async with session(verify_ssl).head(url, allow_redirects=False) as response:
+        if (response.status != 200) or (response.headers.get("Accept-Ranges") != "bytes"):
+            return None
+        if response.headers.get("Content-Type") != "application/octet-stream":
+            return None
+        return response.content_length
+
+
+async def events(url: str, jwt_token: str | None, verify_ssl: bool = True) -> AsyncIterator[bytes]:
+    # Yields the data of each server-sent event, and nothing at all if the server does not stream this URL
+    headers = {"Accept": "text/event-stream", **headers_bearer(jwt_token)}
+    timeout = aiohttp.ClientTimeout(total=None, sock_read=EVENTS_READ_SECONDS)
+    async with session(verify_ssl).get(url, headers=headers, timeout=timeout) as resp:
+        if (resp.status != 200) or (resp.content_type != "text/event-stream"):
+            return
+        data: list[bytes] = []
+        async for line in resp.content:
+            line = line.rstrip(b"\r\n")
+            if line.startswith(b"data:"):
+                data.append(line.removeprefix(b"data:").removeprefix(b" "))
+            elif (not line) and data:
+                yield b"\n".join(data)
+                data = []
+
+
+async def get(url: str, jwt_token: str | None, verify_ssl: bool = True, optional: bool = False) -> bytes:
+    with client_errors(url):
+        async with session(verify_ssl).get(url, headers=headers_bearer(jwt_token)) as resp:
+            if optional and (resp.status in ENDPOINT_MISSING_STATUSES):
+                raise EndpointMissingError(url)
             if resp.status != 200:
                 text = await resp.text()
                 try:
@@ -70,40 +297,120 @@ async def get(url: str, jwt_token: str | None, verify_ssl: bool = True) -> basic
                         show.error_and_exit(f"Request failed: {resp.status} {url}\n{text}")
                 except json.JSONDecodeError:
                     show.error_and_exit(f"Request failed: {resp.status} {url}\n{text}")
-            data = await resp.json()
-            if not basic.is_json(data):
-                show.error_and_exit(f"Unexpected API response: {data}")
-            return data
+            return await resp.read()
 
 
 async def get_url(url: str, verify_ssl: bool = True) -> bytes:
-    connector = None if verify_ssl else aiohttp.TCPConnector(ssl=False)
-    async with aiohttp.ClientSession(connector=connector) as session:
-        async with session.get(url) as response:
-            if response.status != 200:
-                show.error_and_exit(f"URL not found: {url}")
-            return await response.read()
+    async with session(verify_ssl).get(url) as response:
+        if response.status != 200:
+            show.error_and_exit(f"URL not found: {url}")
+        return await response.read()
 
 
-async def post(url: str, args: schema.Strict, jwt_token: str | None, verify_ssl: bool = True) -> basic.JSON:
-    return await post_json(url, args.model_dump(mode="json"), jwt_token, verify_ssl)
+async def get_url_stream(
+    url: str,
+    file: BinaryIO,
+    verify_ssl: bool = True,
+    chunk_size: int = DOWNLOAD_CHUNK_SIZE,
+    update: Callable[[bytes], object] | None = None,
+) -> int:
+    received = 0
+    async with session(verify_ssl).get(url) as response:
+        if response.status != 200:
+            show.error_and_exit(f"URL not found: {url}")
+        async for chunk in response.content.iter_chunked(chunk_size):
+            file.write(chunk)
+            if update is not None:
+                update(chunk)
+            received += len(chunk)
+    return received
 
 
-async def post_json(url: str, args: basic.JSON, jwt_token: str | None, verify_ssl: bool = True) -> basic.JSON:
-    connector = None if verify_ssl else aiohttp.TCPConnector(ssl=False)
-    headers = {}
-    if jwt_token is not None:
-        headers["Authorization"] = f"Bearer {jwt_token}"
-    async with aiohttp.ClientSession(connector=connector, headers=headers) as session:
-        async with session.post(url, json=args) as resp:
-            if resp.status not in (200, 201, 202):
-                text = await resp.text()
-                show.error_and_exit(f"Error message from the API:\n{resp.status} {url}\n{text}")
-
-            try:
-                data = await resp.json()
-                if not basic.is_json(data):
-                    show.error_and_exit(f"Unexpected API response: {data}")
-                return data
-            except Exception as e:
-                show.error_and_exit(f"Python error getting API response:\n{resp.status} {url}\n{e}")
+async def head_size(url: str, verify_ssl: bool = True) -> int | None:
+    async with session(verify_ssl).head(url) as response:
+        if response.status != 200:
+            return None
+        return response.content_length
+
+
+def json_parse(data: bytes) -> basic.JSON:
+    # For responses without a results model, which are otherwise validated straight from the bytes
+    try:
+        parsed = pydantic_core.from_json(data)
+    except ValueError as e:
+        show.error_and_exit(f"Unexpected API response: {e}")
+    if not basic.is_json(parsed):
+        show.error_and_exit(f"Unexpected API response: {parsed}")
+    return parsed
+
+
+def headers_bearer(jwt_token: str | None) -> dict[str, str]:
+    if jwt_token is None:
+        return {}
+    return {"Authorization": f"Bearer {jwt_token}"}
+
+
+async def post(
+    url: str, args: schema.Strict, jwt_token: str | None, verify_ssl: bool = True, optional: bool = False
+) -> bytes:
+    return await post_json(url, args.model_dump(mode="json"), jwt_token, verify_ssl, optional)
+
+
+async def post_file(
+    url: str,
+    args: schema.Strict,
+    path: pathlib.Path,
+    jwt_token: str | None,
+    verify_ssl: bool = True,
+    optional: bool = False,
+) -> bytes:
+    with path.open("rb") as file:
+        return await post_form(url, args, file, path.name, jwt_token, verify_ssl, optional)
+
+
+async def post_form(
+    url: str,
+    args: schema.Strict,
+    content: BinaryIO | AsyncIterator[bytes],
+    filename: str,
+    jwt_token: str | None,
+    verify_ssl: bool = True,
+    optional: bool = False,
+) -> bytes:
+    # The content is streamed by aiohttp in chunks, so memory does not grow with its size
+    form = aiohttp.FormData()
+    for key, value in args.model_dump(mode="json", exclude_none=True).items():
+        form.add_field(key, str(value))
+    form.add_field("content", content, filename=filename, content_type="application/octet-stream")
+    with client_errors(url):
+        async with session(verify_ssl).post(url, data=form, headers=headers_bearer(jwt_token)) as resp:
+            return await response_bytes(resp, url, optional)
+
+
+async def post_json(
+    url: str, args: basic.JSON, jwt_token: str | None, verify_ssl: bool = True, optional: bool = False
+) -> bytes:
+    with client_errors(url):
+        async with session(verify_ssl).post(url, json=args, headers=headers_bearer(jwt_token)) as resp:
+            return await response_bytes(resp, url, optional)
+
+
+async def response_bytes(resp: aiohttp.ClientResponse, url: str, optional: bool = False) -> bytes:
+    if optional and (resp.status in ENDPOINT_MISSING_STATUSES):
+        raise EndpointMissingError(url)
+    if resp.status not in (200, 201, 202):
+        text = await resp.text()
+        show.error_and_exit(f"Error message from the API:\n{resp.status} {url}\n{text}")
+
+    try:
+        return await resp.read()
+    except aiohttp.ClientError as e:
+        show.error_and_exit(f"Python error getting API response:\n{resp.status} {url}\n{e}")
+
+
+def run[T](coroutine: Coroutine[Any, Any, T]) -> T:
+    return POOL.run(coroutine)
+
+
+def session(verify_ssl: bool = True) -> aiohttp.ClientSession:
+    return POOL.session(verify_ssl)
@@ -15,14 +15,24 @@
 # specific language governing permissions and limitations
 # under the License.
 
+import dataclasses
+import io
 import pathlib
+import re
 import types
+from collections.abc import AsyncIterator
 from typing import Any
 
 import aiohttp
+import aiohttp.abc
 import aioresponses.core
+import multidict
 import pytest
 
+import atrclient.agent as agent
+import atrclient.delta as delta
+import atrclient.models as models
+
 
 class ClientResponseShim(aiohttp.ClientResponse):
     # As of aiohttp 3.14, stream_writer is now a required argument
@@ -35,8 +45,104 @@ class ClientResponseShim(aiohttp.ClientResponse):
 setattr(aioresponses.core, "ClientResponse", ClientResponseShim)
 
 
+class DeltaServer:
+    # Stand-in for the release signature and patch endpoints, holding files in memory
+    def __init__(self) -> None:
+        self.files: dict[str, bytes] = {}
+        self.received = 0
+
+    async def patch(self, rel_path: str, base: models.api.DeltaSignature, chunks: AsyncIterator[bytes]) -> None:
+        body = bytearray()
+        async for chunk in chunks:
+            body.extend(chunk)
+        self.received += len(body)
+        target = io.BytesIO()
+        delta.patch(self.files[rel_path], base.block_size, delta.decode(io.BytesIO(body)), target)
+        self.files[rel_path] = target.getvalue()
+
+    async def signatures(self) -> dict[str, models.api.DeltaSignature]:
+        return {rel_path: delta.signature(data) for rel_path, data in self.files.items()}
+
+    async def upload(self, rel_path: str, path: pathlib.Path) -> None:
+        data = path.read_bytes()
+        self.received += len(data)
+        self.files[rel_path] = data
+
+
+@dataclasses.dataclass
+class UploadStream:
+    # Stand-in for the /release/upload/stream endpoint, which consumes each part chunk by chunk
+    chunk_sizes: list[int] = dataclasses.field(default_factory=list)
+    uploads: list[dict[str, bytes]] = dataclasses.field(default_factory=list)
+
+    async def endpoint(self, _url: Any, **kwargs: Any) -> aioresponses.CallbackResult:
+        form = kwargs["data"]
+        assert isinstance(form, aiohttp.FormData)
+        writer = form()
+        assert isinstance(writer, aiohttp.MultipartWriter)
+        fields: dict[str, bytes] = {}
+        for payload, _encoding, _te_encoding in writer:
+            match = re.search(r'name="([^"]+)"', payload.headers["Content-Disposition"])
+            assert match is not None
+            sink = UploadStreamSink(self, bytearray())
+            await payload.write(sink)
+            fields[match.group(1)] = bytes(sink.received)
+        self.uploads.append(fields)
+        return aioresponses.CallbackResult(
+            status=201,
+            payload={
+                "endpoint": "/release/upload",
+                "revision": {
+                    "key": "test-project-2.3.0 00003",
+                    "release_key": "test-project-2.3.0",
+                    "seq": 3,
+                    "number": "00003",
+                    "asfuid": "test_asf_uid",
+                    "phase": "release_candidate_draft",
+                },
+            },
+        )
+
+
+class UploadStreamSink(aiohttp.abc.AbstractStreamWriter):
+    def __init__(self, stream: UploadStream, received: bytearray) -> None:
+        self.stream = stream
+        self.received = received
+
+    async def drain(self) -> None:
+        pass
+
+    def enable_chunking(self) -> None:
+        pass
+
+    def enable_compression(self, encoding: str = "deflate", strategy: int | None = None) -> None:
+        pass
+
+    async def write(self, chunk: bytes | bytearray | memoryview) -> None:
+        self.stream.chunk_sizes.append(len(chunk))
+        self.received.extend(chunk)
+
+    async def write_eof(self, chunk: bytes = b"") -> None:
+        pass
+
+    async def write_headers(self, status_line: str, headers: multidict.CIMultiDict[str]) -> None:
+        pass
+
+
 @pytest.fixture
 def fixture_config_env(monkeypatch: pytest.MonkeyPatch, tmp_path: pathlib.Path) -> pathlib.Path:
     path = tmp_path / "atr.yaml"
     monkeypatch.setenv("ATR_CLIENT_CONFIG_PATH", str(path))
+    # Keep tests away from any sign agent that the developer is running
+    monkeypatch.setenv(agent.SOCKET_ENV, str(tmp_path / "agent.sock"))
     return path
+
+
+@pytest.fixture
+def fixture_delta_server() -> DeltaServer:
+    return DeltaServer()
+
+
+@pytest.fixture
+def fixture_upload_stream() -> UploadStream:
+    return UploadStream()